@@ -0,0 +1,133 @@
+"""
+Admission control for the TextSummarizer application.
+The cost of a summarization request is estimated from its size before any
+ranking runs. Requests that would be too slow on the exact (quadratic) path are
+routed to the approximate path, where the planner picks a faster ranker that
+fits the latency budget; requests too large even for that are turned away, and each user draws from a token bucket sized by their plan's daily
+summary limit. Bucket and in-flight state lives in a store, which app.py keeps
+in SQLite so every worker process enforces the same limits.
+"""
+
+import re
+import threading
+import time
+from collections import namedtuple
+
+# Rough per-operation costs in seconds, measured on generate_summary with the
+# vectorized rankers: exact TextRank builds an n x n similarity graph, everything
+# else (tokenizing, deduplicating, the planner's faster rankers) is about linear
+PAIR_SECONDS = 1e-8
+SENTENCE_SECONDS = 5e-5
+CHAR_SECONDS = 2e-6
+
+EXACT_BUDGET = 5.0  # estimated seconds above which the approximate path is used
+MAX_COST = 20.0  # estimated seconds on the approximate path above which a request is rejected
+SECONDS_PER_SUMMARY = 5.0  # compute time one bucket token pays for; larger requests take more tokens
+STALE_AFTER = 600.0  # seconds after which in-flight counts left by a crashed worker are ignored
+DEFAULT_PLAN = 'unlimited'
+
+# 'unlimited' admits every request that is not too large, as before plans existed;
+# the stricter plans are opt-in
+PLANS = {
+    'unlimited': {'summaries_per_day': None, 'max_concurrent': None},
+    'free': {'summaries_per_day': 5, 'max_concurrent': 1},
+    'basic': {'summaries_per_day': 30, 'max_concurrent': 2},
+    'premium': {'summaries_per_day': None, 'max_concurrent': 4},
+}
+
+_SENTENCE_END = re.compile(r'[.!?。！？．।]+')
+
+Estimate = namedtuple('Estimate', 'chars sentences exact_seconds approximate_seconds')
+# acquired: whether the request holds an in-flight slot in the store that release() must return
+Decision = namedtuple('Decision', 'admitted path reason retry_after estimate acquired')
+
+
+def estimate_cost(text):
+    """
+    Estimate the work a summarization request needs, without tokenizing it.
+
+    Args:
+        text (str): The text to be summarized
+
+    Returns:
+        Estimate: Input size and the predicted seconds on the exact and approximate paths
+    """
+    chars = len(text)
+    sentences = max(1, len(_SENTENCE_END.findall(text)))
+    linear = chars * CHAR_SECONDS + sentences * SENTENCE_SECONDS
+    return Estimate(chars, sentences, linear + sentences * sentences * PAIR_SECONDS, linear)
+
+
+class AdmissionController:
+    """
+    Decides whether, and on which path, a summarization request runs.
+
+    Args:
+        store: Object with acquire(user_id, cost, capacity, rate, max_concurrent, now)
+            returning (admitted, reason, retry_after), and release(user_id)
+        plans (dict): Plan name -> {'summaries_per_day', 'max_concurrent'}; None means no limit
+        exact_budget (float): Estimated seconds allowed on the exact path
+        max_cost (float): Estimated seconds allowed on the approximate path
+    """
+
+    def __init__(self, store, plans=PLANS, exact_budget=EXACT_BUDGET, max_cost=MAX_COST):
+        self.store = store
+        self.plans = plans
+        self.exact_budget = exact_budget
+        self.max_cost = max_cost
+        self._lock = threading.Lock()
+        self.counters = {
+            'exact': 0,
+            'approximate': 0,
+            'rejected_too_large': 0,
+            'rejected_rate_limited': 0,
+            'rejected_busy': 0,
+        }
+
+    def admit(self, user_id, text, plan=DEFAULT_PLAN, now=None):
+        """
+        Admit a request or say why not. An admitted request must be released with its decision.
+
+        Returns:
+            Decision: path is 'exact' or 'approximate'; reason is 'too_large',
+            'rate_limited' or 'busy' for rejected requests
+        """
+        estimate = estimate_cost(text)
+        if estimate.exact_seconds <= self.exact_budget:
+            path, seconds = 'exact', estimate.exact_seconds
+        elif estimate.approximate_seconds <= self.max_cost:
+            path, seconds = 'approximate', estimate.approximate_seconds
+        else:
+            return self._count(Decision(False, None, 'too_large', None, estimate, False))
+
+        limits = self.plans.get(plan, self.plans['free'])
+        per_day = limits['summaries_per_day']
+        if per_day is None and limits['max_concurrent'] is None:
+            # Nothing to enforce, so the store is not touched
+            return self._count(Decision(True, path, None, None, estimate, False))
+        if per_day is None:
+            # Unlimited plan: an empty bucket that nothing is drawn from
+            cost, capacity, rate = 0.0, 0.0, 0.0
+        else:
+            cost = max(1.0, seconds / SECONDS_PER_SUMMARY)
+            capacity, rate = float(per_day), per_day / 86400.0
+
+        admitted, reason, retry_after = self.store.acquire(
+            user_id, cost, capacity, rate, limits['max_concurrent'], time.time() if now is None else now)
+        if not admitted:
+            return self._count(Decision(False, None, reason, retry_after, estimate, False))
+        return self._count(Decision(True, path, None, None, estimate, True))
+
+    def release(self, user_id, decision):
+        if decision.acquired:
+            self.store.release(user_id)
+
+    def _count(self, decision):
+        key = decision.path if decision.admitted else f"rejected_{decision.reason}"
+        with self._lock:
+            self.counters[key] += 1
+        return decision
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters, exact_budget=self.exact_budget, max_cost=self.max_cost)
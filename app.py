@@ -1,31 +1,43 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_file, Response, stream_with_context, abort, copy_current_request_context
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.utils import secure_filename
+from werkzeug.datastructures import FileStorage
 import os
+import io
 import json
-import uuid
-from datetime import datetime
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import re
 import requests
 from bs4 import BeautifulSoup
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
 from nltk.probability import FreqDist
-from nltk.cluster.util import cosine_distance
-import numpy as np
-import networkx as nx
 import docx
-import PyPDF2
 from youtube_transcript_api import YouTubeTranscriptApi
 import urllib.parse
 from fpdf import FPDF
 from dotenv import load_dotenv
-from deep_translator import GoogleTranslator
 
 # Add this import near the top of the file, with the other imports
 import chatbot_responses
+import translation
+import export_cache
+import fonts
+import converter
+import admission
+import rankers
+import planner
+import progress
+import summarizer
+from summarizer import (download_nltk_resources, extract_text_from_path, summary_length, generate_summary,
+                        calculate_rouge_score, calculate_compression_ratio, SUPPORTED_EXTENSIONS)
 
 # Load environment variables
 load_dotenv()
@@ -37,6 +49,34 @@ app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///summarization.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
+app.config['TRANSCRIPT_CACHE_TTL'] = int(os.getenv('TRANSCRIPT_CACHE_TTL', 7 * 24 * 3600))  # seconds
+app.config['TRANSLATION_TIMEOUT'] = float(os.getenv('TRANSLATION_TIMEOUT', 10))  # seconds per call
+app.config['TRANSLATION_HEDGE_AFTER'] = os.getenv('TRANSLATION_HEDGE_AFTER')  # seconds, unset = no hedging
+# 'native' renders PDFs directly; 'docx' goes through DOCX and an installed converter
+app.config['PDF_RENDERER'] = os.getenv('PDF_RENDERER', 'native')
+app.config['BULK_EXPORT_WORKERS'] = int(os.getenv('BULK_EXPORT_WORKERS', 4))
+app.config['REPORT_MAX_SUMMARIES'] = int(os.getenv('REPORT_MAX_SUMMARIES', 500))
+app.config['OFFICE_POOL_SIZE'] = int(os.getenv('OFFICE_POOL_SIZE', 2))  # concurrent office conversions
+app.config['OFFICE_CONVERT_TIMEOUT'] = float(os.getenv('OFFICE_CONVERT_TIMEOUT', 60))  # seconds
+app.config['EXPORT_CACHE_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'export_cache')
+app.config['EXPORT_CACHE_MEMORY_LIMIT'] = int(os.getenv('EXPORT_CACHE_MEMORY_LIMIT', 64 * 1024 * 1024))  # bytes
+app.config['EXPORT_CACHE_DISK_LIMIT'] = int(os.getenv('EXPORT_CACHE_DISK_LIMIT', 512 * 1024 * 1024))  # bytes
+# Users have no stored plan yet, so every account gets this plan's limits; set
+# 'free', 'basic' or 'premium' to enforce daily and concurrent summary limits
+app.config['DEFAULT_PLAN'] = os.getenv('DEFAULT_PLAN', admission.DEFAULT_PLAN)
+app.config['SUMMARY_EXACT_BUDGET'] = float(os.getenv('SUMMARY_EXACT_BUDGET', 5))  # estimated seconds
+app.config['SUMMARY_MAX_COST'] = float(os.getenv('SUMMARY_MAX_COST', 20))  # estimated seconds
+app.config['SUMMARY_LATENCY_BUDGET'] = float(os.getenv('SUMMARY_LATENCY_BUDGET', 2))  # seconds of ranking the planner aims for
+# Seconds after which PageRank returns its ranking so far; unset lets it converge
+app.config['SUMMARY_TIME_LIMIT'] = float(os.getenv('SUMMARY_TIME_LIMIT', 0)) or None
+app.config['SIMILARITY_MEMORY_LIMIT'] = int(os.getenv('SIMILARITY_MEMORY_LIMIT', 256 * 1024 * 1024))  # bytes per graph
+app.config['SIMILARITY_WORKERS'] = int(os.getenv('SIMILARITY_WORKERS', 1))  # processes per large graph
+app.config['SIMILARITY_BLOCK_ROWS'] = int(os.getenv('SIMILARITY_BLOCK_ROWS', 0)) or None  # rows per parallel task
+app.config['SUMMARY_JOB_WORKERS'] = int(os.getenv('SUMMARY_JOB_WORKERS', 4))  # background summaries run at once
+app.config['SUMMARY_JOB_QUEUE'] = int(os.getenv('SUMMARY_JOB_QUEUE', 32))  # running plus waiting jobs per process
+app.config['ANALYSIS_CACHE_MEMORY_LIMIT'] = int(os.getenv('ANALYSIS_CACHE_MEMORY_LIMIT', 256 * 1024 * 1024))  # bytes
+# Comma-separated usernames allowed to read /metrics; empty allows any logged-in user
+app.config['METRICS_USERS'] = {name.strip() for name in os.getenv('METRICS_USERS', '').split(',') if name.strip()}
 
 # Add custom Jinja2 filters
 @app.template_filter('regex_search')
@@ -52,26 +92,31 @@ def regex_replace(text, pattern, replacement):
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Rendered exports, keyed by a hash of their content and styling
+rendered_exports = export_cache.ExportCache(
+    memory_limit=app.config['EXPORT_CACHE_MEMORY_LIMIT'],
+    disk_dir=app.config['EXPORT_CACHE_FOLDER'],
+    disk_limit=app.config['EXPORT_CACHE_DISK_LIMIT']
+)
+
+# Each user's last TextRank graph, so resubmitting edited text only ranks what changed
+summarizer.analysis_cache.memory_limit = app.config['ANALYSIS_CACHE_MEMORY_LIMIT']
+
+# Summaries started from the page, followed by the browser as server-sent events. Jobs
+# live in this process only, so with several workers /summarize/events needs sticky routing
+summary_jobs = progress.JobRegistry()
+summary_executor = ThreadPoolExecutor(max_workers=app.config['SUMMARY_JOB_WORKERS'],
+                                      thread_name_prefix='summary-job')
+# Bounds the jobs running or waiting for a worker, so clients cannot queue unlimited rankings
+summary_job_slots = threading.BoundedSemaphore(app.config['SUMMARY_JOB_QUEUE'])
+
+# Fonts available to the PDF and DOCX exporters, discovered once per process
+font_registry = fonts.FontRegistry(os.path.join(app.root_path, 'static', 'fonts'))
+
 # Initialize extensions
 db = SQLAlchemy(app)
 bcrypt = Bcrypt(app)
 
-# Download NLTK resources
-def download_nltk_resources():
-    resources = ['punkt', 'stopwords']
-    
-    # Add punkt_tab to the list since it's being requested by the code
-    if 'punkt_tab' not in resources:
-        resources.append('punkt_tab')
-        
-    for resource in resources:
-        try:
-            nltk.data.find(f'tokenizers/{resource}')
-        except LookupError:
-            print(f"Downloading NLTK resource: '{resource}'")
-            nltk.download(resource)
-            print(f"Resource '{resource}' has been downloaded successfully.")
-
 # Call this function before the app starts
 download_nltk_resources()
 
@@ -97,31 +142,134 @@ class Summary(db.Model):
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+class TranscriptCache(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    video_id = db.Column(db.String(20), nullable=False, index=True)
+    language = db.Column(db.String(20), nullable=False)  # 'en' or 'any' (first available transcript)
+    segments = db.Column(db.Text, nullable=False)  # JSON list of {'text', 'start', 'duration'}
+    date_fetched = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('video_id', 'language'),)
+
+class TranslationMemory(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    sentence_hash = db.Column(db.String(64), nullable=False)  # sha256 of the normalized source sentence
+    source_language = db.Column(db.String(20), nullable=False)
+    target_language = db.Column(db.String(20), nullable=False)
+    translated_text = db.Column(db.Text, nullable=False)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('sentence_hash', 'source_language', 'target_language'),)
+
+class SQLTranslationMemory:
+    # SQLite limits the number of bound parameters per statement
+    batch_size = 500
+
+    def get_many(self, hashes, source, target):
+        found = {}
+        for i in range(0, len(hashes), self.batch_size):
+            rows = TranslationMemory.query.filter(
+                TranslationMemory.source_language == source,
+                TranslationMemory.target_language == target,
+                TranslationMemory.sentence_hash.in_(hashes[i:i + self.batch_size])
+            ).with_entities(TranslationMemory.sentence_hash, TranslationMemory.translated_text).all()
+            found.update(rows)
+        return found
+
+    def put_many(self, entries, source, target):
+        if not entries:
+            return
+        hashes = list(entries)
+        existing = set(self.get_many(hashes, source, target))
+        for sentence_hash in hashes:
+            if sentence_hash not in existing:
+                db.session.add(TranslationMemory(
+                    sentence_hash=sentence_hash,
+                    source_language=source,
+                    target_language=target,
+                    translated_text=entries[sentence_hash]
+                ))
+        try:
+            db.session.commit()
+        except Exception:
+            # Another worker stored the same sentences first
+            db.session.rollback()
+
+translation_memory = SQLTranslationMemory()
+
+translation.default_client = translation.TranslationClient(
+    translation.google_translator_factory,
+    timeout=app.config['TRANSLATION_TIMEOUT'],
+    hedge_after=float(app.config['TRANSLATION_HEDGE_AFTER']) if app.config['TRANSLATION_HEDGE_AFTER'] else None
+)
+
+class RateLimitState(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)  # summaries left in the bucket
+    updated_at = db.Column(db.Float, nullable=False)  # epoch seconds of the last refill
+    in_flight = db.Column(db.Integer, nullable=False, default=0)
+
+class SQLAdmissionStore:
+    # Each check is a single UPDATE, so concurrent workers cannot both take the last token
+    def acquire(self, user_id, cost, capacity, rate, max_concurrent, now):
+        table = RateLimitState.__table__.name
+        params = {
+            'user_id': user_id, 'cost': cost, 'capacity': capacity, 'rate': rate,
+            'max_concurrent': max_concurrent, 'now': now, 'stale_after': admission.STALE_AFTER
+        }
+        db.session.execute(db.text(
+            f"INSERT OR IGNORE INTO {table} (user_id, tokens, updated_at, in_flight) "
+            f"VALUES (:user_id, :capacity, :now, 0)"
+        ), params)
+        result = db.session.execute(db.text(
+            f"UPDATE {table} SET "
+            f"in_flight = CASE WHEN :now - updated_at > :stale_after THEN 1 ELSE in_flight + 1 END, "
+            f"tokens = MIN(:capacity, tokens + (:now - updated_at) * :rate) - :cost, "
+            f"updated_at = :now "
+            f"WHERE user_id = :user_id "
+            f"AND (in_flight < :max_concurrent OR :now - updated_at > :stale_after) "
+            f"AND MIN(:capacity, tokens + (:now - updated_at) * :rate) >= :cost"
+        ), params)
+        db.session.commit()
+        if result.rowcount == 1:
+            return True, None, None
+
+        state = db.session.get(RateLimitState, user_id)
+        if state.in_flight >= max_concurrent and now - state.updated_at <= admission.STALE_AFTER:
+            return False, 'busy', None
+        available = min(capacity, state.tokens + (now - state.updated_at) * rate)
+        return False, 'rate_limited', (cost - available) / rate if rate else None
+
+    def release(self, user_id):
+        table = RateLimitState.__table__.name
+        db.session.execute(db.text(
+            f"UPDATE {table} SET in_flight = MAX(in_flight - 1, 0) WHERE user_id = :user_id"
+        ), {'user_id': user_id})
+        db.session.commit()
+
+# Ceiling for each similarity graph built while ranking, and the processes that share
+# the work on large documents
+rankers.SIMILARITY_MEMORY_LIMIT = app.config['SIMILARITY_MEMORY_LIMIT']
+rankers.SIMILARITY_WORKERS = app.config['SIMILARITY_WORKERS']
+rankers.SIMILARITY_BLOCK_ROWS = app.config['SIMILARITY_BLOCK_ROWS']
+
+admission_control = admission.AdmissionController(
+    SQLAdmissionStore(),
+    exact_budget=app.config['SUMMARY_EXACT_BUDGET'],
+    max_cost=app.config['SUMMARY_MAX_COST']
+)
+
 # Helper Functions
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'txt', 'pdf', 'docx'}
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in SUPPORTED_EXTENSIONS
 
-def extract_text_from_file(file):
+def extract_text_from_file(file, progress=None):
     filename = secure_filename(file.filename)
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     file.save(file_path)
     
-    file_type = filename.rsplit('.', 1)[1].lower()
     text = ""
     
     try:
-        if file_type == 'txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-        elif file_type == 'pdf':
-            with open(file_path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                for page_num in range(len(pdf_reader.pages)):
-                    text += pdf_reader.pages[page_num].extract_text()
-        elif file_type == 'docx':
-            doc = docx.Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + '\n'
+        text = extract_text_from_path(file_path, progress)
     except Exception as e:
         print(f"Error extracting text: {e}")
     finally:
@@ -156,197 +304,145 @@ def extract_text_from_url(url):
         print(f"Error extracting text from URL: {e}")
         return ""
 
-def extract_text_from_youtube(youtube_url):
+def get_youtube_video_id(youtube_url):
+    video_id = None
+    if 'youtube.com' in youtube_url:
+        query = urllib.parse.urlparse(youtube_url).query
+        params = dict(urllib.parse.parse_qsl(query))
+        video_id = params.get('v')
+    elif 'youtu.be' in youtube_url:
+        video_id = youtube_url.split('/')[-1].split('?')[0]
+    return video_id
+
+def get_cached_transcript(video_id, language):
+    try:
+        entry = TranscriptCache.query.filter_by(video_id=video_id, language=language).first()
+        if entry is None:
+            return None
+        age = (datetime.utcnow() - entry.date_fetched).total_seconds()
+        if age > app.config['TRANSCRIPT_CACHE_TTL']:
+            return None
+        return json.loads(entry.segments)
+    except Exception as e:
+        print(f"Transcript cache read error: {e}")
+        return None
+
+def store_cached_transcript(video_id, language, transcript):
+    # Keep the timestamps so time-range requests can be served from the cache later
+    segments = [
+        {'text': item['text'], 'start': item.get('start', 0.0), 'duration': item.get('duration', 0.0)}
+        for item in transcript
+    ]
+    try:
+        entry = TranscriptCache.query.filter_by(video_id=video_id, language=language).first()
+        if entry is None:
+            entry = TranscriptCache(video_id=video_id, language=language)
+            db.session.add(entry)
+        entry.segments = json.dumps(segments, ensure_ascii=False)
+        entry.date_fetched = datetime.utcnow()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Transcript cache write error: {e}")
+    return segments
+
+def get_youtube_transcript(video_id):
+    # Serve from the cache first; English is preferred over any other language
+    for language in ('en', 'any'):
+        segments = get_cached_transcript(video_id, language)
+        if segments is not None:
+            return segments
+
+    try:
+        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
+        language = 'en'
+    except Exception:
+        # Try to get transcript in any available language if English fails
+        transcript = YouTubeTranscriptApi.get_transcript(video_id)
+        language = 'any'
+
+    if not transcript:
+        return transcript
+    return store_cached_transcript(video_id, language, transcript)
+
+def assemble_transcript_text(segments, start_time=None, end_time=None):
+    text_segments = []
+    current_sentence = []
+    current_word_count = 0  # running count, so long unpunctuated captions stay linear
+
+    for item in segments:
+        # Only keep segments that overlap the requested time range
+        segment_start = item.get('start', 0.0)
+        segment_end = segment_start + item.get('duration', 0.0)
+        if start_time is not None and segment_end < start_time:
+            continue
+        if end_time is not None and segment_start > end_time:
+            continue
+
+        text = item['text'].strip()
+        if not text:  # Skip empty segments
+            continue
+
+        # Add text to current sentence
+        current_sentence.append(text)
+        current_word_count += len(text.split())
+
+        # Check if the text ends with sentence-ending punctuation
+        if text[-1] in '.!?':
+            # Join the current sentence and add it to segments
+            text_segments.append(' '.join(current_sentence))
+            current_sentence = []
+            current_word_count = 0
+        # If sentence is getting too long without punctuation, force a break
+        elif current_word_count > 20:
+            text_segments.append(' '.join(current_sentence) + '.')
+            current_sentence = []
+            current_word_count = 0
+
+    # Add any remaining text as a sentence
+    if current_sentence:
+        text_segments.append(' '.join(current_sentence) + '.')
+
+    # Join all segments with proper spacing
+    text = ' '.join(text_segments)
+    # Clean up multiple spaces and normalize punctuation
+    return re.sub(r'\s+', ' ', text)
+
+def extract_text_from_youtube(youtube_url, start_time=None, end_time=None, progress=None):
     try:
         # Extract video ID from URL
-        video_id = None
-        if 'youtube.com' in youtube_url:
-            query = urllib.parse.urlparse(youtube_url).query
-            params = dict(urllib.parse.parse_qsl(query))
-            video_id = params.get('v')
-        elif 'youtu.be' in youtube_url:
-            video_id = youtube_url.split('/')[-1].split('?')[0]
-        
+        video_id = get_youtube_video_id(youtube_url)
+
         if not video_id:
             return "Error: Invalid YouTube URL. Please provide a valid YouTube video URL."
-            
-        # Get transcript with better error handling
+
+        # Get transcript (cached per video) with better error handling
         try:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
+            transcript = get_youtube_transcript(video_id)
         except Exception as e:
-            # Try to get transcript in any available language if English fails
-            try:
-                transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            except Exception as e:
-                if "No transcripts were found" in str(e):
-                    return "Error: This video has no captions available. Please try a different video with captions enabled."
-                elif "Could not find the requested language" in str(e):
-                    return "Error: English captions not available. Please try a video with English captions."
-                else:
-                    return f"Error: Could not fetch transcript. Please ensure the video has captions enabled and is publicly accessible."
-            
+            if "No transcripts were found" in str(e):
+                return "Error: This video has no captions available. Please try a different video with captions enabled."
+            elif "Could not find the requested language" in str(e):
+                return "Error: English captions not available. Please try a video with English captions."
+            else:
+                return f"Error: Could not fetch transcript. Please ensure the video has captions enabled and is publicly accessible."
+
         if not transcript:
             return "Error: No transcript content found. Please try a different video."
-            
+        if progress is not None:
+            progress('extract', segments=len(transcript))
+
         # Process transcript to combine text and remove timestamps
-        text_segments = []
-        current_sentence = []
-        
-        for item in transcript:
-            text = item['text'].strip()
-            if not text:  # Skip empty segments
-                continue
-                
-            # Add text to current sentence
-            current_sentence.append(text)
-            
-            # Check if the text ends with sentence-ending punctuation
-            if text[-1] in '.!?':
-                # Join the current sentence and add it to segments
-                text_segments.append(' '.join(current_sentence))
-                current_sentence = []
-            # If sentence is getting too long without punctuation, force a break
-            elif len(' '.join(current_sentence).split()) > 20:
-                text_segments.append(' '.join(current_sentence) + '.')
-                current_sentence = []
-        
-        # Add any remaining text as a sentence
-        if current_sentence:
-            text_segments.append(' '.join(current_sentence) + '.')
-        
-        # Join all segments with proper spacing
-        text = ' '.join(text_segments)
-        # Clean up multiple spaces and normalize punctuation
-        text = re.sub(r'\s+', ' ', text)
-        
+        text = assemble_transcript_text(transcript, start_time, end_time)
+
         if not text.strip():
             return "Error: No readable text could be extracted from the video captions."
-            
+
         return text
-        
+
     except Exception as e:
         return f"Error: An unexpected error occurred while processing the YouTube video. Please try again or use a different video."
 
-def sentence_similarity(sent1, sent2, stopwords=None):
-    if stopwords is None:
-        stopwords = []
-    
-    sent1 = [word.lower() for word in sent1]
-    sent2 = [word.lower() for word in sent2]
-    
-    all_words = list(set(sent1 + sent2))
-    
-    vector1 = [0] * len(all_words)
-    vector2 = [0] * len(all_words)
-    
-    # Build the vector for the first sentence
-    for w in sent1:
-        if w in stopwords:
-            continue
-        vector1[all_words.index(w)] += 1
-    
-    # Build the vector for the second sentence
-    for w in sent2:
-        if w in stopwords:
-            continue
-        vector2[all_words.index(w)] += 1
-    
-    return 1 - cosine_distance(vector1, vector2)
-
-def build_similarity_matrix(sentences, stop_words):
-    # Create an empty similarity matrix
-    similarity_matrix = np.zeros((len(sentences), len(sentences)))
-    
-    for idx1 in range(len(sentences)):
-        for idx2 in range(len(sentences)):
-            if idx1 == idx2:  # ignore if both are same sentences
-                continue
-            similarity_matrix[idx1][idx2] = sentence_similarity(
-                sentences[idx1], sentences[idx2], stop_words)
-                
-    return similarity_matrix
-
-def generate_summary(text, num_sentences=5):
-    stop_words = set(stopwords.words('english'))
-    summarize_text = []
-    
-    # Use custom sentence tokenization for non-Latin scripts
-    def tokenize_sentences(text):
-        # Check if text contains CJK characters (Chinese, Japanese)
-        if any('\u4e00' <= char <= '\u9fff' for char in text) or \
-           any('\u3040' <= char <= '\u309f' for char in text) or \
-           any('\u30a0' <= char <= '\u30ff' for char in text):
-            # Split on common CJK sentence endings
-            sentences = []
-            current = ""
-            for char in text:
-                current += char
-                if char in ['。', '！', '？', '．', '!', '?', '.']:
-                    if current.strip():
-                        sentences.append(current.strip())
-                    current = ""
-            if current.strip():
-                sentences.append(current.strip())
-            return sentences
-        # Check if text contains Hindi characters
-        elif any('\u0900' <= char <= '\u097f' for char in text):
-            # Split on common Hindi sentence endings
-            sentences = []
-            current = ""
-            for char in text:
-                current += char
-                if char in ['।', '!', '?', '.']:
-                    if current.strip():
-                        sentences.append(current.strip())
-                    current = ""
-            if current.strip():
-                sentences.append(current.strip())
-            return sentences
-        else:
-            # Use NLTK for other languages
-            return sent_tokenize(text)
-    
-    # Step 1 - Split text into sentences using custom tokenization
-    sentences = tokenize_sentences(text)
-    
-    # Check if there are enough sentences to summarize
-    if len(sentences) <= num_sentences:
-        return ' '.join(sentences)
-    
-    # Step 2 - Tokenize the sentences
-    sentence_tokens = [word_tokenize(s.lower()) for s in sentences]
-    
-    # Step 3 - Create similarity matrix
-    sentence_similarity_matrix = build_similarity_matrix(sentence_tokens, stop_words)
-    
-    # Step 4 - Rank sentences using PageRank algorithm
-    sentence_similarity_graph = nx.from_numpy_array(sentence_similarity_matrix)
-    scores = nx.pagerank(sentence_similarity_graph)
-    
-    # Step 5 - Sort the sentences by score and select top n
-    ranked_sentences = sorted(((scores[i], s) for i, s in enumerate(sentences)), reverse=True)
-    
-    for i in range(min(num_sentences, len(ranked_sentences))):
-        summarize_text.append(ranked_sentences[i][1])
-    
-    # Step 6 - Reorder the selected sentences based on their original order
-    summarize_text.sort(key=lambda x: sentences.index(x))
-    
-    # Step 7 - Return the summarized text
-    return ' '.join(summarize_text)
-
-def calculate_rouge_score(reference, summary):
-    # Simple ROUGE-1 calculation (word overlap)
-    reference_words = set(word_tokenize(reference.lower()))
-    summary_words = set(word_tokenize(summary.lower()))
-    
-    overlap = reference_words.intersection(summary_words)
-    
-    if len(reference_words) == 0:
-        return 0
-    
-    return len(overlap) / len(reference_words)
-
 def format_summary_as_bullets(summary_text):
     # Custom sentence tokenization for different languages
     def tokenize_sentences(text):
@@ -450,37 +546,28 @@ def format_summary_as_paragraphs(summary_text):
 
 def create_docx(title, content, language='en', font_style='Arial', font_size=16):
     import docx
+    from docx.oxml.ns import qn
     doc = docx.Document()
     doc.core_properties.language = language
 
-    # Language-specific font mapping
-    font_map = {
-        'ja': 'MS Gothic',  # Japanese font
-        'zh': 'SimSun',     # Chinese font
-        'hi': 'Arial Unicode MS',  # Hindi font
-        'default': font_style  # Use user-selected font as default
-    }
-
-    # Detect language based on content
-    def detect_language(text):
-        if any('\u4e00' <= char <= '\u9fff' for char in text):  # Chinese characters
-            return 'zh'
-        elif any('\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff' for char in text):  # Japanese characters
-            return 'ja'
-        elif any('\u0900' <= char <= '\u097f' for char in text):  # Hindi characters
-            return 'hi'
-        return 'default'
+    # Script-aware font lookup shared with the PDF exporter
+    script = fonts.detect_script(content, language)
+    docx_font = font_registry.docx_font(font_style, script)
+    east_asian = script in fonts.EAST_ASIAN_SCRIPTS
 
-    detected_language = detect_language(content)
-    docx_font = font_map.get(detected_language, font_style)
+    def apply_font(run, size):
+        font = run.font
+        font.name = docx_font
+        font.size = docx.shared.Pt(size)
+        if east_asian:
+            # font.name only covers Latin text; CJK glyphs use the eastAsia slot
+            run._element.get_or_add_rPr().get_or_add_rFonts().set(qn('w:eastAsia'), docx_font)
 
     # Add title
     title_para = doc.add_heading(level=0)
     title_run = title_para.add_run(title)
     try:
-        font = title_run.font
-        font.name = docx_font
-        font.size = docx.shared.Pt(font_size + 4)
+        apply_font(title_run, font_size + 4)
     except Exception as e:
         print(f"DOCX Title Font Error: {e}. Using default font.")
 
@@ -499,151 +586,484 @@ def create_docx(title, content, language='en', font_style='Arial', font_size=16)
             p = doc.add_paragraph()
             run = p.add_run(line)
         try:
-            font = run.font
-            font.name = docx_font
-            font.size = docx.shared.Pt(font_size)
+            apply_font(run, font_size)
         except Exception as e:
             print(f"DOCX Content Font Error: {e}. Using default font.")
 
-    filename = f"summary_{uuid.uuid4()}.docx"
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    doc.save(file_path)
-    return file_path
-
-def create_pdf(title, content, language='en', font_style='Arial', font_size=16):
-    from fpdf import FPDF
-    pdf = FPDF()
-    pdf.add_page()
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
 
-    # Expanded font map for PDF
-    font_map = {
-        'Arial': 'Arial',
-        'Helvetica': 'helvetica',
-        'Times New Roman': 'Times',
-        'Times': 'Times',
-        'Courier New': 'Courier',
-        'Courier': 'Courier',
-        'Verdana': 'Verdana',
-        'Georgia': 'Georgia',
-        'Palatino': 'Palatino',
-        'Garamond': 'Garamond',
-        'Bookman': 'Bookman',
-        'Comic Sans MS': 'ComicSansMS',
-        'Trebuchet MS': 'TrebuchetMS',
-        'Arial Black': 'ArialBlack',
-        'Impact': 'Impact',
-        'Lucida Console': 'LucidaConsole',
-        'Tahoma': 'Tahoma',
-        'Geneva': 'Geneva',
-        'Lucida Sans Unicode': 'LucidaSansUnicode',
-        'Noto Sans': 'NotoSans',
-        'Noto Sans Kannada': 'NotoSansKannada',
-        'Noto Sans CJK': 'NotoSansCJK',
-        'Segoe UI': 'SegoeUI',
-        'Calibri': 'Calibri',
-        'Cambria': 'Cambria',
-    }
-    fpdf_font = font_map.get(font_style, font_style)
-
-    # Path to font files
-    font_dir = os.path.join(os.path.dirname(__file__), 'static', 'fonts')
-    font_files = {
-        'Verdana': 'Verdana.ttf',
-        'Georgia': 'Georgia.ttf',
-        'Palatino': 'Palatino.ttf',
-        'Garamond': 'Garamond.ttf',
-        'Bookman': 'Bookman.ttf',
-        'ComicSansMS': 'ComicSansMS.ttf',
-        'TrebuchetMS': 'TrebuchetMS.ttf',
-        'ArialBlack': 'ArialBlack.ttf',
-        'Impact': 'Impact.ttf',
-        'LucidaConsole': 'LucidaConsole.ttf',
-        'Tahoma': 'Tahoma.ttf',
-        'Geneva': 'Geneva.ttf',
-        'LucidaSansUnicode': 'LucidaSansUnicode.ttf',
-        'NotoSans': 'NotoSans-Regular.ttf',
-        'NotoSansKannada': 'NotoSansKannada-Regular.ttf',
-        'NotoSansCJK': 'NotoSansCJK-Regular.ttf',
-        'SegoeUI': 'SegoeUI.ttf',
-        'Calibri': 'calibri.ttf',
-        'Cambria': 'cambria.ttf',
-    }
+def set_pdf_font(pdf, font_style, font_size, script=None):
+    # Fonts come from the process-wide registry; embedded TTFs are parsed once per
+    # process and registered once per document. Returns True for a Unicode font.
+    for candidate in font_registry.pdf_font_chain(font_style, script):
+        try:
+            font_registry.register_pdf_font(pdf, candidate)
+            pdf.set_font(candidate, size=font_size)
+            return True
+        except Exception as e:
+            print(f"PDF Font Error: {e}. Trying the next font for this script.")
 
-    # Register font if custom font is selected and file exists
     try:
-        if language in ['zh-CN', 'ja', 'ko']:
-            cjk_font_path = os.path.join(font_dir, font_files['NotoSansCJK'])
-            if os.path.exists(cjk_font_path):
-                pdf.add_font('NotoSansCJK', '', cjk_font_path, uni=True)
-                pdf.set_font('NotoSansCJK', size=font_size)
-            else:
-                pdf.set_font(fpdf_font, size=font_size)
-        elif language == 'kn':
-            kannada_font_path = os.path.join(font_dir, font_files['NotoSansKannada'])
-            if os.path.exists(kannada_font_path):
-                pdf.add_font('NotoSansKannada', '', kannada_font_path, uni=True)
-                pdf.set_font('NotoSansKannada', size=font_size)
-            else:
-                pdf.set_font(fpdf_font, size=font_size)
-        elif fpdf_font in font_files:
-            font_path = os.path.join(font_dir, font_files[fpdf_font])
-            if os.path.exists(font_path):
-                pdf.add_font(fpdf_font, '', font_path, uni=True)
-                pdf.set_font(fpdf_font, size=font_size)
-            else:
-                pdf.set_font(fpdf_font, size=font_size)
-        else:
-            pdf.set_font(fpdf_font, size=font_size)
+        pdf.set_font(font_registry.pdf_builtin_family(font_style), size=font_size)
     except Exception as e:
         print(f"PDF Font Error: {e}. Falling back to Arial.")
         pdf.set_font("Arial", size=font_size)
+    return False
 
-    # Add title
+def pdf_text(text, unicode_font):
+    # Built-in fonts only cover latin-1; keep the export going instead of failing
+    return text if unicode_font else text.encode('latin-1', 'replace').decode('latin-1')
+
+def write_pdf_title(pdf, title, font_size, unicode_font):
+    # Larger, bold where the font has a bold face, centered and underlined with a
+    # rule. TrueType fonts are registered without a bold variant.
+    family = pdf.font_family
+    line_height = font_size * 0.5 + 2
     try:
-        pdf.set_font(pdf.font_family, 'B', font_size + 4)
-        pdf.cell(200, 10, txt=title, ln=True, align='C')
-        pdf.ln(10)
-        pdf.set_font(pdf.font_family, '', font_size)
+        pdf.set_font(family, '' if unicode_font else 'B', font_size + 4)
     except Exception as e:
         print(f"PDF Title Font Error: {e}. Falling back to Arial Bold.")
         pdf.set_font("Arial", 'B', font_size + 4)
-        pdf.cell(200, 10, txt=title, ln=True, align='C')
-        pdf.ln(10)
-        pdf.set_font("Arial", '', font_size)
-
-    # Add content line by line to preserve font
-    lines = content.split('\n')
-    for line in lines:
+    pdf.multi_cell(0, line_height + 2, txt=pdf_text(title, unicode_font), align='C')
+    pdf.ln(2)
+    pdf.line(pdf.l_margin, pdf.get_y(), pdf.w - pdf.r_margin, pdf.get_y())
+    pdf.ln(line_height)
+    pdf.set_font(family, '', font_size)
+
+def write_pdf_body(pdf, content, font_size, unicode_font):
+    # Content goes line by line; bullet lines get a hanging indent and blank lines
+    # (paragraph breaks) become vertical space
+    line_height = font_size * 0.5 + 2
+    bullet_width = font_size * 0.5
+    previous_blank = True
+    for line in content.split('\n'):
         line = line.strip()
         if not line:
+            if not previous_blank:
+                pdf.ln(line_height * 0.6)
+            previous_blank = True
             continue
-        pdf.multi_cell(0, 10, txt=line)
+        previous_blank = False
+        if line[0] in ('•', '・'):
+            bullet = line[0] if unicode_font else '-'
+            pdf.cell(bullet_width, line_height, txt=bullet)
+            left_margin = pdf.l_margin
+            pdf.set_left_margin(left_margin + bullet_width)
+            pdf.multi_cell(0, line_height, txt=pdf_text(line[1:].strip(), unicode_font))
+            pdf.set_left_margin(left_margin)
+        else:
+            pdf.multi_cell(0, line_height, txt=pdf_text(line, unicode_font))
 
-    filename = f"summary_{uuid.uuid4()}.pdf"
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf.output(file_path)
-    return file_path
+def pdf_bytes(pdf):
+    output = pdf.output(dest='S')
+    # PyFPDF returns a latin-1 string, fpdf2 returns a bytearray
+    if isinstance(output, str):
+        output = output.encode('latin-1')
+    return bytes(output)
 
-def calculate_compression_ratio(original_text, summary_text):
-    if not original_text or not summary_text:
-        return 0.0  # Return minimum compression ratio instead of 0
-    
-    # Clean and normalize text before calculating ratio
-    original_text = re.sub(r'\s+', ' ', original_text.strip())
-    summary_text = re.sub(r'\s+', ' ', summary_text.strip())
-    
-    # Calculate lengths using word count for more meaningful ratio
-    original_words = len(word_tokenize(original_text))
-    summary_words = len(word_tokenize(summary_text))
-    
-    if original_words == 0 or summary_words > original_words:  # Avoid division by zero and invalid ratios
-        return 0.0  # Return minimum compression ratio
-    
-    # Calculate compression (how much text was removed)
-    compression = (original_words - summary_words) / original_words
-    # Ensure ratio is between 0 and 1
-    compression = max(0.0, min(1.0, compression))
-    return compression
+def create_pdf(title, content, language='en', font_style='Arial', font_size=16):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+
+    script = fonts.detect_script(content + title, language)
+    unicode_font = set_pdf_font(pdf, font_style, font_size, script)
+    write_pdf_title(pdf, title, font_size, unicode_font)
+    write_pdf_body(pdf, content, font_size, unicode_font)
+    return pdf_bytes(pdf)
+
+# Summaries fetched from the database per round trip during bulk export
+BULK_EXPORT_BATCH_SIZE = 50
+
+EXPORT_MIMETYPES = {
+    'txt': 'text/plain; charset=utf-8',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pdf': 'application/pdf',
+}
+
+# Rendered views of recently seen summary texts; summaries are immutable, so the
+# text itself is the key, and translated texts get their own entries
+VIEW_CACHE_SIZE = 256
+
+@lru_cache(maxsize=VIEW_CACHE_SIZE)
+def format_views(text):
+    """
+    Render a summary in every view the result page can show.
+
+    Args:
+        text (str): The summary (or translated summary) text
+
+    Returns:
+        dict: 'plain', 'bullet' and 'paragraph' renderings of the text
+    """
+    # Detect language and format text accordingly
+    def detect_language(text):
+        if any('\u4e00' <= char <= '\u9fff' for char in text):  # Chinese
+            return 'zh'
+        elif any('\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff' for char in text):  # Japanese
+            return 'ja'
+        elif any('\u0900' <= char <= '\u097f' for char in text):  # Hindi
+            return 'hi'
+        return 'en'
+
+    language = detect_language(text)
+
+    if language in ['ja', 'zh', 'hi']:
+        # Custom formatting for CJK and Hindi; split once for both views
+        sentences = []
+        current = ""
+        for char in text:
+            current += char
+            if (language in ['ja', 'zh'] and char in ['。', '！', '？', '．', '!', '?', '.']) or \
+               (language == 'hi' and char in ['।', '!', '?', '.']):
+                if current.strip():
+                    sentences.append(current.strip())
+                current = ""
+        if current.strip():
+            sentences.append(current.strip())
+
+        bullet = '・' if language == 'ja' else '•'
+        bullet_text = '\n'.join([f"{bullet} {sentence}" for sentence in sentences])
+
+        # Group sentences into paragraphs
+        paragraphs = []
+        current_paragraph = []
+        for i, sentence in enumerate(sentences):
+            current_paragraph.append(sentence)
+            if (i + 1) % 3 == 0 or i == len(sentences) - 1:
+                paragraphs.append(' '.join(current_paragraph))
+                current_paragraph = []
+        paragraph_text = '\n\n'.join(paragraphs)
+    else:
+        bullet_text = format_summary_as_bullets(text)
+        paragraph_text = format_summary_as_paragraphs(text)
+
+    return {'plain': text, 'bullet': bullet_text, 'paragraph': paragraph_text}
+
+def format_export_text(current_text, view_type):
+    return format_views(current_text).get(view_type, current_text)
+
+def probe_pdf_converters():
+    # Checked once at startup so exports do not pay for converters that can never work
+    import platform
+    converters = []
+    if platform.system() in ('Windows', 'Darwin'):
+        # Both of these drive an installed Microsoft Word
+        try:
+            import docx2pdf  # noqa: F401
+            converters.append('docx2pdf')
+        except ImportError:
+            pass
+        if platform.system() == 'Windows':
+            try:
+                import comtypes.client  # noqa: F401
+                import pythoncom  # noqa: F401
+                converters.append('comtypes')
+            except ImportError:
+                pass
+    # LibreOffice is only used through the warm worker pool, never spawned per export
+    if converter.office_available():
+        converters.append('office_pool')
+    return converters
+
+PDF_CONVERTERS = probe_pdf_converters()
+
+# Warm headless office processes for DOCX-to-PDF; started on first use
+office_pool = converter.ConverterPool(
+    size=app.config['OFFICE_POOL_SIZE'],
+    convert_timeout=app.config['OFFICE_CONVERT_TIMEOUT']
+)
+
+def convert_docx_to_pdf(docx_path, pdf_path, converter_name):
+    if converter_name == 'docx2pdf':
+        from docx2pdf import convert
+        convert(docx_path, pdf_path)
+    elif converter_name == 'comtypes':
+        import comtypes.client
+        import pythoncom
+        pythoncom.CoInitialize()
+        word = comtypes.client.CreateObject('Word.Application')
+        doc = word.Documents.Open(os.path.abspath(docx_path))
+        doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)
+        doc.Close()
+        word.Quit()
+    elif converter_name == 'office_pool':
+        office_pool.convert(docx_path, pdf_path)
+    elif converter_name == 'libreoffice':
+        # One-off process; kept for comparison in benchmarks.py
+        import subprocess
+        executable = 'libreoffice' if shutil.which('libreoffice') else 'soffice'
+        subprocess.run([
+            executable, '--headless', '--convert-to', 'pdf', '--outdir',
+            os.path.dirname(pdf_path), docx_path
+        ], check=True)
+        # LibreOffice names the PDF the same as the DOCX but with .pdf
+        libre_pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
+        if libre_pdf_path != pdf_path and os.path.exists(libre_pdf_path):
+            os.rename(libre_pdf_path, pdf_path)
+    return os.path.exists(pdf_path)
+
+def render_pdf_export(title, formatted_text, target_language, font_style, font_size, renderer=None):
+    renderer = renderer or app.config['PDF_RENDERER']
+    converters = PDF_CONVERTERS if renderer == 'docx' else []
+
+    if converters:
+        # Build the DOCX and hand it to the converters found at startup; they
+        # work on files, so they get a private temporary directory
+        docx_data = create_docx(title, formatted_text, target_language, font_style, font_size)
+        with tempfile.TemporaryDirectory() as work_dir:
+            docx_path = os.path.join(work_dir, 'summary.docx')
+            pdf_path = os.path.join(work_dir, 'summary.pdf')
+            with open(docx_path, 'wb') as f:
+                f.write(docx_data)
+            for converter_name in converters:
+                try:
+                    if convert_docx_to_pdf(docx_path, pdf_path, converter_name):
+                        with open(pdf_path, 'rb') as f:
+                            return f.read()
+                except Exception as e:
+                    print(f"{converter_name} conversion failed: {e}")
+        print('All DOCX to PDF conversions failed, falling back to direct PDF.')
+
+    # Native rendering: bullets, paragraphs, Unicode fonts and title styling are
+    # handled by create_pdf without an office suite
+    return create_pdf(title, formatted_text, target_language, font_style, font_size)
+
+def render_export(title, text, export_format, target_language='en', font_style='Arial',
+                  font_size='16px', view_type='plain', cache=True):
+    # Bulk ZIP entries pass cache=False: they are rarely downloaded again, and
+    # hundreds of them would evict the memory LRU and fill the disk tier
+    if cache:
+        cache_key = export_cache.make_key(
+            title=title, text=text, export_format=export_format,
+            font_style=font_style, font_size=font_size, view_type=view_type,
+            target_language=target_language
+        )
+        data = rendered_exports.get(cache_key)
+        if data is not None:
+            return data
+
+    formatted_text = format_export_text(text, view_type)
+
+    # Convert font size from px to int (default 16)
+    try:
+        font_size_int = int(font_size.replace('px', ''))
+    except Exception:
+        font_size_int = 16
+
+    if export_format == 'txt':
+        # Plain text with font info as header
+        data = (
+            f"Font: {font_style}, Size: {font_size}\n\n"
+            f"{title}\n\n"
+            f"{formatted_text}"
+        ).encode('utf-8')
+    elif export_format == 'pdf':
+        data = render_pdf_export(title, formatted_text, target_language, font_style, font_size_int)
+    elif export_format == 'docx':
+        data = create_docx(title, formatted_text, target_language, font_style, font_size_int)
+
+    if data and cache:
+        rendered_exports.put(cache_key, data)
+    return data
+
+class ZipStream:
+    # Write-only file object for zipfile; the bytes written are handed out in pieces
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = self.buffer.getvalue()
+        self.buffer = io.BytesIO()
+        return data
+
+def stream_zip(rows, render_entry, max_workers=None):
+    """Yield a ZIP archive piece by piece, rendering entries in a worker pool.
+
+    At most twice the worker count of entries are in flight, and each entry is
+    written to the archive and sent as soon as it is rendered, so memory stays
+    bounded however many rows there are.
+    """
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    max_workers = max_workers or app.config['BULK_EXPORT_WORKERS']
+    stream = ZipStream()
+    # zipfile writes data descriptors instead of seeking back when the
+    # target is not seekable, which is what allows streaming
+    archive = zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED)
+    rows = iter(rows)
+
+    def write_done(done):
+        for future in done:
+            try:
+                name, data = future.result()
+            except Exception as e:
+                print(f"Bulk export entry failed: {e}")
+                continue
+            if data:
+                archive.writestr(name, data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_workers * 2:
+                row = next(rows, None)
+                if row is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(render_entry, row))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write_done(done)
+            chunk = stream.take()
+            if chunk:
+                yield chunk
+
+    archive.close()
+    yield stream.take()
+
+def fetch_report_sections(summary_ids, user_id, batch_size=BULK_EXPORT_BATCH_SIZE):
+    # Sections are loaded a batch at a time, in the requested order, so the whole
+    # report never has every Summary row in memory at once
+    for i in range(0, len(summary_ids), batch_size):
+        batch = summary_ids[i:i + batch_size]
+        rows = Summary.query.filter(Summary.id.in_(batch), Summary.user_id == user_id).with_entities(
+            Summary.id, Summary.title, Summary.summary_text
+        ).all()
+        by_id = {row.id: row for row in rows}
+        for summary_id in batch:
+            row = by_id.get(summary_id)
+            if row is not None:
+                yield row.id, row.title, row.summary_text
+
+def build_docx_report(report_title, entries, sections, font_style='Arial', font_size=12, view_type='plain'):
+    """Build one DOCX from many summaries: a contents list, then one section per summary.
+
+    entries is the list of (id, title) pairs for the contents; sections yields
+    (id, title, text) in the same order and is consumed incrementally.
+    """
+    import docx
+    from docx.enum.text import WD_BREAK
+    from docx.oxml.ns import qn
+    doc = docx.Document()
+
+    # Shared styles are set up once for the whole document instead of on every run
+    titles_script = fonts.detect_script(' '.join(title for _, title in entries))
+    docx_font = font_registry.docx_font(font_style, titles_script)
+    for style_name, size in (('Normal', font_size), ('List Bullet', font_size),
+                             ('Heading 1', font_size + 4), ('Title', font_size + 8)):
+        style = doc.styles[style_name]
+        style.font.name = docx_font
+        style.font.size = docx.shared.Pt(size)
+        if titles_script in fonts.EAST_ASIAN_SCRIPTS:
+            style.element.get_or_add_rPr().get_or_add_rFonts().set(qn('w:eastAsia'), docx_font)
+
+    doc.add_heading(report_title, level=0)
+    doc.add_paragraph('Contents').runs[0].bold = True
+    for number, (_, title) in enumerate(entries, start=1):
+        doc.add_paragraph(f"{number}. {title}")
+
+    for _, title, text in sections:
+        doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+        doc.add_heading(title, level=1)
+
+        # Only sections in a different script than the styles need per-run fonts
+        script = fonts.detect_script(text)
+        section_font = font_registry.docx_font(font_style, script) if script != titles_script else None
+        for line in format_export_text(text, view_type).split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('•') or line.startswith('・'):
+                run = doc.add_paragraph(style='List Bullet').add_run(line[1:].strip())
+            else:
+                run = doc.add_paragraph().add_run(line)
+            if section_font:
+                run.font.name = section_font
+                if script in fonts.EAST_ASIAN_SCRIPTS:
+                    run._element.get_or_add_rPr().get_or_add_rFonts().set(qn('w:eastAsia'), section_font)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def build_pdf_report(report_title, entries, sections, font_style='Arial', font_size=12, view_type='plain'):
+    """Build one PDF from many summaries: a linked table of contents, then one section per summary.
+
+    Pages for the contents are reserved up front and filled in once the page
+    number of every section is known, so sections can be written as they arrive.
+    """
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+
+    titles_script = fonts.detect_script(report_title + ' '.join(title for _, title in entries))
+    unicode_font = set_pdf_font(pdf, font_style, font_size, titles_script)
+    write_pdf_title(pdf, report_title, font_size, unicode_font)
+
+    line_height = font_size * 0.5 + 2
+    toc_page = pdf.page_no()
+    toc_y = pdf.get_y()
+    first_page_lines = int((pdf.h - pdf.b_margin - toc_y) / line_height) - 1  # one line for the heading
+    page_lines = int((pdf.h - pdf.t_margin - pdf.b_margin) / line_height)
+    overflow = max(0, len(entries) - first_page_lines)
+    for _ in range((overflow + page_lines - 1) // page_lines):
+        pdf.add_page()
+
+    links = {}
+    section_pages = {}
+    for summary_id, title, text in sections:
+        pdf.add_page()
+        links[summary_id] = pdf.add_link()
+        pdf.set_link(links[summary_id])
+        section_pages[summary_id] = pdf.page_no()
+        script = fonts.detect_script(title + text)
+        section_unicode = set_pdf_font(pdf, font_style, font_size, script)
+        write_pdf_title(pdf, title, font_size, section_unicode)
+        write_pdf_body(pdf, format_export_text(text, view_type), font_size, section_unicode)
+
+    # Go back and fill in the reserved contents pages
+    last_page = pdf.page
+    pdf.set_auto_page_break(False)
+    pdf.page = toc_page
+    unicode_font = set_pdf_font(pdf, font_style, font_size, titles_script)
+    pdf.set_xy(pdf.l_margin, toc_y)
+    pdf.cell(0, line_height, txt='Contents', ln=1)
+    number_width = pdf.get_string_width('0000') + 2
+    title_width = pdf.w - pdf.l_margin - pdf.r_margin - number_width
+    for number, (summary_id, title) in enumerate(entries, start=1):
+        if summary_id not in section_pages:
+            continue
+        if pdf.get_y() + line_height > pdf.h - pdf.b_margin:
+            pdf.page += 1
+            pdf.set_xy(pdf.l_margin, pdf.t_margin)
+        label = pdf_text(f"{number}. {title}", unicode_font)
+        while len(label) > 4 and pdf.get_string_width(label) > title_width - 2:
+            label = label[:-4] + '...'
+        pdf.cell(title_width, line_height, txt=label, link=links[summary_id])
+        pdf.cell(number_width, line_height, txt=str(section_pages[summary_id]), ln=1, align='R',
+                 link=links[summary_id])
+    pdf.page = last_page
+    pdf.set_auto_page_break(True, margin=15)
+
+    return pdf_bytes(pdf)
+
+REPORT_BUILDERS = {
+    'docx': build_docx_report,
+    'pdf': build_pdf_report,
+}
 
 # Routes
 @app.route('/')
@@ -719,6 +1139,156 @@ def dashboard():
     
     return render_template('dashboard.html', user=user, summaries=summaries)
 
+class SummaryRejected(Exception):
+    """A summarization request that cannot be served, with the message for the user."""
+
+    def __init__(self, message, category='danger'):
+        super().__init__(message)
+        self.category = category
+
+def extract_source(source_type, form, files, progress=None):
+    """Extract the text to summarize and its title from the submitted form."""
+    original_text = ""
+    title = "Summary"
+
+    if source_type == 'file':
+        if 'file' not in files:
+            raise SummaryRejected('No file part')
+
+        file = files['file']
+
+        if file.filename == '':
+            raise SummaryRejected('No selected file')
+
+        if file and allowed_file(file.filename):
+            original_text = extract_text_from_file(file, progress)
+            title = file.filename
+        else:
+            raise SummaryRejected('File type not supported. Please upload a TXT, PDF, or DOCX file.')
+
+    elif source_type == 'url':
+        url = form.get('url')
+        if not url:
+            raise SummaryRejected('Please enter a URL')
+
+        original_text = extract_text_from_url(url)
+        title = url
+
+    elif source_type == 'youtube':
+        youtube_url = form.get('youtube_url')
+        if not youtube_url:
+            raise SummaryRejected('Please enter a YouTube URL')
+
+        # Optional time range in seconds, e.g. to summarize one section of a long video
+        start_time = form.get('start_time', type=float)
+        end_time = form.get('end_time', type=float)
+
+        try:
+            original_text = extract_text_from_youtube(youtube_url, start_time, end_time, progress)
+            if not original_text:
+                raise SummaryRejected('Could not extract transcript from the YouTube video. Please ensure the video has captions available.')
+            title = youtube_url
+        except ValueError as e:
+            raise SummaryRejected(str(e))
+
+    elif source_type == 'text':
+        original_text = form.get('text', '')
+        title = "Manual Text Input"
+
+    if not original_text:
+        raise SummaryRejected('No text could be extracted from the source.')
+    if progress is not None:
+        progress('extract', characters=len(original_text))
+    return original_text, title
+
+def summarize_text(user_id, title, original_text, source_type, compression_ratio, ranker, progress=None):
+    """
+    Summarize extracted text within the user's limits and save the summary.
+
+    Returns:
+        tuple: (summary, views, metrics) with the saved Summary, its rendered views
+        and the metrics shown with it
+    """
+    # Estimate the cost before any ranking and check the user's limits
+    decision = admission_control.admit(user_id, original_text, app.config['DEFAULT_PLAN'])
+    if not decision.admitted:
+        if decision.reason == 'too_large':
+            raise SummaryRejected('This text is too large to summarize. Please split it into smaller parts.')
+        elif decision.reason == 'busy':
+            raise SummaryRejected('Your previous summary is still being processed. Please wait for it to finish.', 'warning')
+        elif decision.retry_after:
+            raise SummaryRejected(f'You have reached your summary limit. Please try again in {int(decision.retry_after // 60) + 1} minutes.', 'warning')
+        else:
+            raise SummaryRejected('You have reached your summary limit.', 'warning')
+
+    try:
+        # Calculate number of sentences based on compression ratio
+        num_sentences = summary_length(original_text, compression_ratio)
+
+        # Generate summary; on the approximate path the planner picks the most accurate
+        # ranker that fits the latency budget instead of exact TextRank
+        summary_stats = {}
+        summary_text = generate_summary(original_text, num_sentences, stats=summary_stats,
+                                        ranker='auto' if decision.path == 'approximate' else ranker,
+                                        budget=app.config['SUMMARY_LATENCY_BUDGET'],
+                                        previous=user_id, progress=progress,
+                                        time_limit=app.config['SUMMARY_TIME_LIMIT'])
+    finally:
+        admission_control.release(user_id, decision)
+
+    if progress is not None:
+        progress('stage', stage='formatting')
+
+    # Calculate actual compression ratio based on word count
+    actual_compression = calculate_compression_ratio(original_text, summary_text)
+
+    # Render every view once, so switching views on the page needs no request
+    views = format_views(summary_text)
+
+    # Calculate metrics
+    word_count = len(word_tokenize(summary_text))
+    sentence_count = len(sent_tokenize(summary_text))
+    rouge_score = calculate_rouge_score(original_text, summary_text)
+
+    if progress is not None:
+        progress('stage', stage='saving')
+
+    # Save summary to database
+    new_summary = Summary(
+        title=title,
+        original_text=original_text,
+        summary_text=summary_text,
+        source_type=source_type,
+        compression_ratio=actual_compression,
+        user_id=user_id
+    )
+    db.session.add(new_summary)
+    db.session.commit()
+
+    metrics = {
+        'word_count': word_count,
+        'sentence_count': sentence_count,
+        'compression_ratio': actual_compression,
+        'rouge_score': rouge_score,
+        'duplicates_removed': summary_stats.get('duplicates_removed', 0),
+        'ranking_path': decision.path,
+        'ranker': summary_stats.get('ranker'),
+        'ranking_strategy': summary_stats.get('strategy'),
+        'predicted_ranking_seconds': summary_stats.get('predicted_seconds'),
+        'ranking_seconds': summary_stats.get('ranking_seconds'),
+        'ranking_converged': summary_stats.get('converged', True),
+        'ranking_iterations': summary_stats.get('iterations', 0),
+        'reused_sentences': summary_stats.get('reused_sentences', 0)
+    }
+    return new_summary, views, metrics
+
+def summary_options(form):
+    compression_ratio = float(form.get('compression_ratio', 50)) / 100
+    ranker = form.get('ranker', 'auto')
+    if ranker != 'auto' and ranker not in rankers.RANKERS:
+        ranker = 'auto'
+    return compression_ratio, ranker
+
 @app.route('/summarize', methods=['GET', 'POST'])
 def summarize():
     if 'user_id' not in session:
@@ -727,109 +1297,23 @@ def summarize():
         
     if request.method == 'POST':
         source_type = request.form.get('source_type')
-        compression_ratio = float(request.form.get('compression_ratio', 50)) / 100
         view_type = request.form.get('view_type', 'plain')
-        
-        original_text = ""
-        title = "Summary"
-        
-        if source_type == 'file':
-            if 'file' not in request.files:
-                flash('No file part', 'danger')
-                return redirect(request.url)
-                
-            file = request.files['file']
-            
-            if file.filename == '':
-                flash('No selected file', 'danger')
-                return redirect(request.url)
-                
-            if file and allowed_file(file.filename):
-                original_text = extract_text_from_file(file)
-                title = file.filename
-            else:
-                flash('File type not supported. Please upload a TXT, PDF, or DOCX file.', 'danger')
-                return redirect(request.url)
-                
-        elif source_type == 'url':
-            url = request.form.get('url')
-            if not url:
-                flash('Please enter a URL', 'danger')
-                return redirect(request.url)
-                
-            original_text = extract_text_from_url(url)
-            title = url
-            
-        elif source_type == 'youtube':
-            youtube_url = request.form.get('youtube_url')
-            if not youtube_url:
-                flash('Please enter a YouTube URL', 'danger')
-                return redirect(request.url)
-                
-            try:
-                original_text = extract_text_from_youtube(youtube_url)
-                if not original_text:
-                    flash('Could not extract transcript from the YouTube video. Please ensure the video has captions available.', 'danger')
-                    return redirect(request.url)
-                title = youtube_url
-            except ValueError as e:
-                flash(str(e), 'danger')
-                return redirect(request.url)
-            
-        elif source_type == 'text':
-            original_text = request.form.get('text', '')
-            title = "Manual Text Input"
-            
-        if not original_text:
-            flash('No text could be extracted from the source.', 'danger')
+        compression_ratio, ranker = summary_options(request.form)
+
+        try:
+            original_text, title = extract_source(source_type, request.form, request.files)
+            new_summary, views, metrics = summarize_text(session['user_id'], title, original_text, source_type,
+                                                         compression_ratio, ranker)
+        except SummaryRejected as e:
+            flash(str(e), e.category)
             return redirect(request.url)
-            
-        # Calculate number of sentences based on compression ratio
-        sentences = sent_tokenize(original_text)
-        num_sentences = max(1, int(len(sentences) * (1 - compression_ratio)))
-        
-        # Generate summary
-        summary_text = generate_summary(original_text, num_sentences)
-        
-        # Calculate actual compression ratio based on word count
-        actual_compression = calculate_compression_ratio(original_text, summary_text)
-        
-        # Format summary based on view type
-        formatted_summary = summary_text
-        if view_type == 'bullet':
-            formatted_summary = format_summary_as_bullets(summary_text)
-        elif view_type == 'paragraph':
-            formatted_summary = format_summary_as_paragraphs(summary_text)
-        
-        # Calculate metrics
-        word_count = len(word_tokenize(summary_text))
-        sentence_count = len(sent_tokenize(summary_text))
-        rouge_score = calculate_rouge_score(original_text, summary_text)
-        
-        # Save summary to database
-        new_summary = Summary(
-            title=title,
-            original_text=original_text,
-            summary_text=summary_text,
-            source_type=source_type,
-            compression_ratio=actual_compression,
-            user_id=session['user_id']
-        )
-        db.session.add(new_summary)
-        db.session.commit()
-        
-        metrics = {
-            'word_count': word_count,
-            'sentence_count': sentence_count,
-            'compression_ratio': actual_compression,
-            'rouge_score': rouge_score
-        }
         
         return render_template(
             'summary_result.html',
             title=title,
             original_text=original_text,
-            summary_text=formatted_summary,
+            summary_text=views.get(view_type, new_summary.summary_text),
+            views=views,
             metrics=metrics,
             view_type=view_type,
             summary_id=new_summary.id
@@ -837,6 +1321,66 @@ def summarize():
         
     return render_template('summarize.html')
 
+@app.route('/summarize/start', methods=['POST'])
+def start_summary():
+    """
+    Start summarizing in the background and return the job to follow at
+    /summarize/events/<job_id>. Takes the same form as /summarize.
+
+    Jobs run on summary_executor and are kept in this process's summary_jobs, so
+    the events must be requested from the same process: run a single worker or
+    route each user's requests to the same one (sticky sessions).
+    """
+    if 'user_id' not in session:
+        return jsonify({'error': 'Please log in to use the summarization tool.'}), 401
+
+    user_id = session['user_id']
+    source_type = request.form.get('source_type')
+    compression_ratio, ranker = summary_options(request.form)
+    form = request.form.copy()
+    # The upload is read now: its stream closes when this request ends
+    files = {}
+    if 'file' in request.files:
+        upload = request.files['file']
+        files['file'] = FileStorage(io.BytesIO(upload.read()), filename=upload.filename)
+    if not summary_job_slots.acquire(blocking=False):
+        return jsonify({'error': 'The server is busy. Please try again in a moment.'}), 503
+    job = summary_jobs.create(user_id)
+
+    @copy_current_request_context
+    def run():
+        try:
+            original_text, title = extract_source(source_type, form, files, job.emit)
+            new_summary, _, metrics = summarize_text(user_id, title, original_text, source_type,
+                                                     compression_ratio, ranker, job.emit)
+            job.finish('done', summary_id=new_summary.id, summary=new_summary.summary_text,
+                       url=url_for('view_summary', summary_id=new_summary.id), metrics=metrics)
+        except SummaryRejected as e:
+            job.finish('error', message=str(e))
+        except Exception as e:
+            print(f"Summary job error: {e}")
+            job.finish('error', message='An unexpected error occurred while summarizing. Please try again.')
+        finally:
+            summary_job_slots.release()
+
+    summary_executor.submit(run)
+    return jsonify({'job_id': job.id, 'events_url': url_for('summary_events', job_id=job.id)}), 202
+
+@app.route('/summarize/events/<job_id>')
+def summary_events(job_id):
+    """
+    Server-sent events of a summary job: 'extract' (pages, transcript segments,
+    characters), 'sentences', 'preview', 'ranking' (iterations), 'stage'
+    (formatting, saving), then 'done' with the summary or 'error'.
+    """
+    job = summary_jobs.get(job_id)
+    if 'user_id' not in session or job is None or job.owner != session['user_id']:
+        abort(404)
+    # A reconnecting EventSource resumes after the last event it received
+    after = request.headers.get('Last-Event-ID', default=0, type=int)
+    return Response(job.stream(after), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/summary/<int:summary_id>')
 def view_summary(summary_id):
     if 'user_id' not in session:
@@ -867,6 +1411,7 @@ def view_summary(summary_id):
         title=summary.title,
         original_text=summary.original_text,
         summary_text=summary.summary_text,
+        views=format_views(summary.summary_text),
         metrics=metrics,
         view_type='plain',
         summary_id=summary.id
@@ -874,61 +1419,10 @@ def view_summary(summary_id):
 
 @app.route('/format_summary', methods=['POST'])
 def format_summary():
-    import re
-    summary_text = request.form.get('summary_text')
+    # Kept for older pages; the result page now receives every view up front
+    summary_text = request.form.get('summary_text', '')
     view_type = request.form.get('view_type')
-
-    def detect_language(text):
-        if any('\u4e00' <= char <= '\u9fff' for char in text):  # Chinese
-            return 'zh'
-        elif any('\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff' for char in text):  # Japanese
-            return 'ja'
-        elif any('\u0900' <= char <= '\u097f' for char in text):  # Hindi
-            return 'hi'
-        return 'en'
-
-    language = detect_language(summary_text)
-
-    def custom_tokenize(text, lang):
-        if lang == 'ja' or lang == 'zh':
-            sentences = [s.strip() for s in re.split(r'[。！？．!?。]', text) if s.strip()]
-            if len(sentences) <= 1 and len(text) > 40:
-                sentences = [text[i:i+40] for i in range(0, len(text), 40)]
-            return sentences
-        elif lang == 'hi':
-            sentences = [s.strip() for s in re.split(r'[।!?\.]', text) if s.strip()]
-            if len(sentences) <= 1 and len(text) > 30:
-                sentences = [text[i:i+30] for i in range(0, len(text), 30)]
-            return sentences
-        else:
-            return None  # fallback to default
-
-    if language in ['ja', 'zh', 'hi']:
-        sentences = custom_tokenize(summary_text, language)
-        if view_type == 'bullet':
-            bullet = '・' if language == 'ja' else '•'
-            formatted_text = '\n'.join([f"{bullet} {sentence}" for sentence in sentences])
-        elif view_type == 'paragraph':
-            paragraphs = []
-            current_paragraph = []
-            for i, sentence in enumerate(sentences):
-                current_paragraph.append(sentence)
-                if (i + 1) % 3 == 0 or i == len(sentences) - 1:
-                    paragraphs.append(' '.join(current_paragraph))
-                    current_paragraph = []
-            formatted_text = '\n\n'.join(paragraphs)
-        else:
-            formatted_text = summary_text
-    else:
-        # Use default helpers for other languages
-        if view_type == 'bullet':
-            formatted_text = format_summary_as_bullets(summary_text)
-        elif view_type == 'paragraph':
-            formatted_text = format_summary_as_paragraphs(summary_text)
-        else:
-            formatted_text = summary_text
-
-    return jsonify({'formatted_text': formatted_text})
+    return jsonify({'formatted_text': format_views(summary_text).get(view_type, summary_text)})
 
 @app.route('/export_summary/<int:summary_id>', methods=['POST'])
 def export_summary(summary_id):
@@ -948,164 +1442,143 @@ def export_summary(summary_id):
     font_size = request.form.get('font_size', '16px')
     font_style = request.form.get('font_style', 'Arial')
     view_type = request.form.get('view_type', 'plain')
-    file_path = None
-    
+
+    if export_format not in EXPORT_MIMETYPES:
+        flash('Error exporting summary.', 'danger')
+        return redirect(url_for('view_summary', summary_id=summary_id))
+
     try:
         # Get the current translated text if available, otherwise use original summary
         current_text = request.form.get('current_text', summary.summary_text)
-        
-        # Detect language and format text accordingly
-        def detect_language(text):
-            if any('\u4e00' <= char <= '\u9fff' for char in text):  # Chinese
-                return 'zh'
-            elif any('\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff' for char in text):  # Japanese
-                return 'ja'
-            elif any('\u0900' <= char <= '\u097f' for char in text):  # Hindi
-                return 'hi'
-            return 'en'
-        
-        language = detect_language(current_text)
-        
-        # Format the text based on view_type and language
-        if view_type == 'bullet':
-            if language in ['ja', 'zh', 'hi']:
-                # Custom bullet formatting for CJK and Hindi
-                sentences = []
-                current = ""
-                for char in current_text:
-                    current += char
-                    if (language in ['ja', 'zh'] and char in ['。', '！', '？', '．', '!', '?', '.']) or \
-                       (language == 'hi' and char in ['।', '!', '?', '.']):
-                        if current.strip():
-                            sentences.append(current.strip())
-                        current = ""
-                if current.strip():
-                    sentences.append(current.strip())
-                
-                bullet = '・' if language == 'ja' else '•'
-                formatted_text = '\n'.join([f"{bullet} {sentence}" for sentence in sentences])
-            else:
-                formatted_text = format_summary_as_bullets(current_text)
-                
-        elif view_type == 'paragraph':
-            if language in ['ja', 'zh', 'hi']:
-                # Custom paragraph formatting for CJK and Hindi
-                sentences = []
-                current = ""
-                for char in current_text:
-                    current += char
-                    if (language in ['ja', 'zh'] and char in ['。', '！', '？', '．', '!', '?', '.']) or \
-                       (language == 'hi' and char in ['।', '!', '?', '.']):
-                        if current.strip():
-                            sentences.append(current.strip())
-                        current = ""
-                if current.strip():
-                    sentences.append(current.strip())
-                
-                # Group sentences into paragraphs
-                paragraphs = []
-                current_paragraph = []
-                for i, sentence in enumerate(sentences):
-                    current_paragraph.append(sentence)
-                    if (i + 1) % 3 == 0 or i == len(sentences) - 1:
-                        paragraphs.append(' '.join(current_paragraph))
-                        current_paragraph = []
-                
-                formatted_text = '\n\n'.join(paragraphs)
-            else:
-                formatted_text = format_summary_as_paragraphs(current_text)
-        else:  # plain
-            formatted_text = current_text
-        
-        # Convert font size from px to int (default 16)
-        try:
-            font_size_int = int(font_size.replace('px', ''))
-        except Exception:
-            font_size_int = 16
-        
-        if export_format == 'txt':
-            # Create a text file with font info as header
-            filename = f"summary_{uuid.uuid4()}.txt"
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"Font: {font_style}, Size: {font_size}\n\n")
-                f.write(f"{summary.title}\n\n")
-                f.write(formatted_text)
-        elif export_format == 'pdf':
-            try:
-                # Always create DOCX first
-                docx_path = create_docx(summary.title, formatted_text, target_language, font_style, font_size_int)
-                pdf_path = os.path.join(app.config['UPLOAD_FOLDER'], f"summary_{uuid.uuid4()}.pdf")
-                conversion_success = False
 
-                # Try docx2pdf
-                try:
-                    from docx2pdf import convert
-                    convert(docx_path, pdf_path)
-                    conversion_success = os.path.exists(pdf_path)
-                except Exception as e:
-                    print(f"docx2pdf conversion failed: {e}")
-
-                # If docx2pdf failed, try using comtypes (Windows only)
-                if not conversion_success:
-                    try:
-                        import comtypes.client
-                        import pythoncom
-                        pythoncom.CoInitialize()
-                        word = comtypes.client.CreateObject('Word.Application')
-                        doc = word.Documents.Open(os.path.abspath(docx_path))
-                        doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)
-                        doc.Close()
-                        word.Quit()
-                        conversion_success = os.path.exists(pdf_path)
-                    except Exception as e:
-                        print(f"comtypes conversion failed: {e}")
-
-                # (Optional) Try using libreoffice as a last resort (Linux)
-                if not conversion_success:
-                    try:
-                        import subprocess
-                        subprocess.run([
-                            'libreoffice', '--headless', '--convert-to', 'pdf', '--outdir',
-                            os.path.dirname(pdf_path), docx_path
-                        ], check=True)
-                        # LibreOffice names the PDF the same as the DOCX but with .pdf
-                        libre_pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
-                        if os.path.exists(libre_pdf_path):
-                            os.rename(libre_pdf_path, pdf_path)
-                            conversion_success = True
-                    except Exception as e:
-                        print(f"libreoffice conversion failed: {e}")
-
-                # If all conversions failed, fall back to direct PDF (may lose formatting)
-                if not conversion_success:
-                    print('All DOCX to PDF conversions failed, falling back to direct PDF.')
-                    pdf_path = create_pdf(summary.title, formatted_text, target_language, font_style, font_size_int)
-
-                # Clean up the temporary DOCX file
-                if os.path.exists(docx_path):
-                    os.remove(docx_path)
-
-                file_path = pdf_path
+        try:
+            data = render_export(summary.title, current_text, export_format, target_language,
+                                 font_style, font_size, view_type)
+        except Exception as e:
+            if export_format != 'pdf':
+                raise
+            print(f"Error in PDF conversion: {str(e)}")
+            flash('Error creating PDF. Please try again.', 'danger')
+            return redirect(url_for('view_summary', summary_id=summary_id))
 
-            except Exception as e:
-                print(f"Error in PDF conversion: {str(e)}")
-                flash('Error creating PDF. Please try again.', 'danger')
-                return redirect(url_for('view_summary', summary_id=summary_id))
-        elif export_format == 'docx':
-            file_path = create_docx(summary.title, formatted_text, target_language, font_style, font_size_int)
-        
-        if file_path:
-            return send_file(file_path, as_attachment=True)
+        if data:
+            # Streamed straight from memory; nothing is left behind in the upload folder
+            return send_file(
+                io.BytesIO(data),
+                mimetype=EXPORT_MIMETYPES[export_format],
+                as_attachment=True,
+                download_name=f"summary_{summary_id}.{export_format}"
+            )
         else:
             flash('Error exporting summary.', 'danger')
             return redirect(url_for('view_summary', summary_id=summary_id))
-            
+
     except Exception as e:
         print(f"Export error: {str(e)}")
         flash('Error exporting summary. Please try again.', 'danger')
         return redirect(url_for('view_summary', summary_id=summary_id))
 
+@app.route('/export_all', methods=['GET', 'POST'])
+def export_all():
+    if 'user_id' not in session:
+        flash('Please log in to export summaries.', 'warning')
+        return redirect(url_for('login'))
+
+    export_format = request.values.get('export_format', 'txt')
+    font_size = request.values.get('font_size', '16px')
+    font_style = request.values.get('font_style', 'Arial')
+    view_type = request.values.get('view_type', 'plain')
+
+    if export_format not in EXPORT_MIMETYPES:
+        flash('Please choose TXT, DOCX or PDF for the export.', 'danger')
+        return redirect(url_for('dashboard'))
+
+    # Optional date range (YYYY-MM-DD, both inclusive) for incremental exports
+    try:
+        start_date = request.values.get('start_date')
+        start_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_date = request.values.get('end_date')
+        end_date = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) if end_date else None
+    except ValueError:
+        flash('Dates must be in YYYY-MM-DD format.', 'danger')
+        return redirect(url_for('dashboard'))
+
+    query = Summary.query.filter_by(user_id=session['user_id'])
+    if start_date:
+        query = query.filter(Summary.date_created >= start_date)
+    if end_date:
+        query = query.filter(Summary.date_created < end_date)
+    # Only the columns needed for rendering; the original texts are never loaded
+    rows = query.order_by(Summary.date_created).with_entities(
+        Summary.id, Summary.title, Summary.summary_text, Summary.date_created
+    ).yield_per(BULK_EXPORT_BATCH_SIZE)
+
+    def render_entry(row):
+        data = render_export(row.title, row.summary_text, export_format, 'en', font_style, font_size, view_type,
+                             cache=False)
+        name = secure_filename(row.title)[:60] or 'summary'
+        return f"{row.date_created:%Y-%m-%d}_{row.id}_{name}.{export_format}", data
+
+    archive_name = f"summaries_{datetime.utcnow():%Y%m%d}.zip"
+    return Response(
+        stream_with_context(stream_zip(rows, render_entry)),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{archive_name}"'}
+    )
+
+@app.route('/export_report', methods=['POST'])
+def export_report():
+    if 'user_id' not in session:
+        flash('Please log in to export summaries.', 'warning')
+        return redirect(url_for('login'))
+
+    export_format = request.form.get('export_format', 'pdf')
+    report_title = request.form.get('report_title') or 'Summary Report'
+    font_style = request.form.get('font_style', 'Arial')
+    view_type = request.form.get('view_type', 'plain')
+    try:
+        font_size = int(request.form.get('font_size', '12px').replace('px', ''))
+    except ValueError:
+        font_size = 12
+
+    # Accept repeated summary_ids fields or a comma-separated list, keeping the order
+    summary_ids = []
+    for value in request.form.getlist('summary_ids'):
+        for part in value.split(','):
+            if part.strip().isdigit() and int(part) not in summary_ids:
+                summary_ids.append(int(part))
+
+    if export_format not in REPORT_BUILDERS or not summary_ids:
+        flash('Choose at least one summary and DOCX or PDF for the report.', 'danger')
+        return redirect(url_for('dashboard'))
+    if len(summary_ids) > app.config['REPORT_MAX_SUMMARIES']:
+        flash(f"A report can include at most {app.config['REPORT_MAX_SUMMARIES']} summaries.", 'danger')
+        return redirect(url_for('dashboard'))
+
+    # Only titles are needed up front, for the table of contents
+    titles = dict(Summary.query.filter(
+        Summary.id.in_(summary_ids), Summary.user_id == session['user_id']
+    ).with_entities(Summary.id, Summary.title).all())
+    entries = [(summary_id, titles[summary_id]) for summary_id in summary_ids if summary_id in titles]
+    if not entries:
+        flash('None of the selected summaries could be found.', 'danger')
+        return redirect(url_for('dashboard'))
+
+    try:
+        sections = fetch_report_sections([summary_id for summary_id, _ in entries], session['user_id'])
+        data = REPORT_BUILDERS[export_format](report_title, entries, sections, font_style, font_size, view_type)
+    except Exception as e:
+        print(f"Report export error: {str(e)}")
+        flash('Error creating the report. Please try again.', 'danger')
+        return redirect(url_for('dashboard'))
+
+    return send_file(
+        io.BytesIO(data),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        as_attachment=True,
+        download_name=f"summary_report_{datetime.utcnow():%Y%m%d}.{export_format}"
+    )
+
 @app.route('/about')
 def about():
     return render_template('about.html')
@@ -1174,56 +1647,54 @@ def translate_summary():
         return jsonify({'error': 'Missing required parameters'}), 400
         
     try:
-        # First try with explicit source language
-        translator = GoogleTranslator(source=source_language, target=target_language)
-        
-        # Split text into smaller chunks if it's too long (API limit is 5000 chars)
-        max_chunk_size = 4000
-        text_chunks = [text[i:i + max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-        
-        # Translate each chunk and combine
-        translated_chunks = []
-        for chunk in text_chunks:
-            try:
-                translated_chunk = translator.translate(chunk)
-                translated_chunks.append(translated_chunk)
-            except Exception as chunk_error:
-                print(f"Chunk translation error with source {source_language}: {str(chunk_error)}")
-                # If chunk translation fails, try with auto source language
-                translator = GoogleTranslator(source='auto', target=target_language)
-                translated_chunk = translator.translate(chunk)
-                translated_chunks.append(translated_chunk)
-        
-        translated_text = ' '.join(translated_chunks)
-        
+        # Only sentences missing from the cache and translation memory are sent out,
+        # in sentence-aligned chunks translated concurrently
+        translation_stats = {}
+        translated_text = translation.translate_text(
+            text, target_language, source_language,
+            memory=translation_memory, stats=translation_stats
+        )
+
         # Verify the translation was successful
         if not translated_text or translated_text.isspace():
             raise Exception("Translation resulted in empty text")
-            
+
         return jsonify({
             'translated_text': translated_text,
+            'views': format_views(translated_text),
             'source_language': source_language,
-            'target_language': target_language
+            'target_language': target_language,
+            'metrics': translation_stats
         })
-            
+
+    except translation.TranslationUnavailable as e:
+        print(f"Translation unavailable: {str(e)}")
+        return jsonify({'error': 'Translation service is busy or unavailable. Please try again in a moment.'}), 503
     except Exception as e:
         print(f"Translation error: {str(e)}")
-        # Try one more time with auto source language
-        try:
-            translator = GoogleTranslator(source='auto', target=target_language)
-            translated_text = translator.translate(text)
-            
-            if not translated_text or translated_text.isspace():
-                raise Exception("Translation resulted in empty text")
-                
-            return jsonify({
-                'translated_text': translated_text,
-                'source_language': 'auto',
-                'target_language': target_language
-            })
-        except Exception as retry_error:
-            print(f"Retry translation error: {str(retry_error)}")
-            return jsonify({'error': 'Translation failed. Please try again or reset to original text.'}), 500
+        return jsonify({'error': 'Translation failed. Please try again or reset to original text.'}), 500
+
+@app.route('/metrics')
+def service_metrics():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Please log in to view service metrics.'}), 401
+    if app.config['METRICS_USERS']:
+        user = db.session.get(User, session['user_id'])
+        if user is None or user.username not in app.config['METRICS_USERS']:
+            return jsonify({'error': 'You are not allowed to view service metrics.'}), 403
+
+    return jsonify({
+        'translation': translation.get_metrics(),
+        'translation_client': translation.default_client.snapshot(),
+        'export_cache': rendered_exports.snapshot(),
+        'pdf_converters': PDF_CONVERTERS,
+        'office_pool': office_pool.snapshot(),
+        'fonts': font_registry.snapshot(),
+        'admission': admission_control.snapshot(),
+        'planner': planner.default_planner.snapshot(),
+        'analysis_cache': summarizer.analysis_cache.snapshot(),
+        'summary_jobs': summary_jobs.snapshot()
+    })
 
 @app.route('/forgot_password', methods=['GET', 'POST'])
 def forgot_password():
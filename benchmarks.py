@@ -0,0 +1,529 @@
+"""
+Benchmarks for the TextSummarizer application.
+
+Usage:
+    python benchmarks.py export-pdf [--runs N]
+    python benchmarks.py report [--runs N]
+    python benchmarks.py chatbot [--runs N]
+    python benchmarks.py rankers [--runs N]
+    python benchmarks.py planner [--runs N]
+    python benchmarks.py pagerank [--runs N]
+    python benchmarks.py memory [--runs N]
+    python benchmarks.py parallel [--runs N]
+    python benchmarks.py tokens [--runs N]
+    python benchmarks.py embeddings [--runs N]
+    python benchmarks.py incremental [--runs N]
+
+Each benchmark prints one line per variant with the mean and best time per run.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+
+def timeit(func, runs):
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def report(name, timings, extra=''):
+    print(f"{name:<28} mean {statistics.mean(timings) * 1000:9.1f} ms   "
+          f"best {min(timings) * 1000:9.1f} ms   {extra}")
+
+
+SAMPLE_SUMMARY = '\n'.join(
+    f"• Sentence {i} of the sample summary explains one of the key points in some detail."
+    for i in range(40)
+)
+
+
+def bench_export_pdf(args):
+    from app import app, create_docx, create_pdf, convert_docx_to_pdf, render_pdf_export, office_pool
+
+    title = 'Benchmark summary'
+
+    def legacy_cascade():
+        # What every PDF export used to do: try each converter in turn, then fall back
+        docx_data = create_docx(title, SAMPLE_SUMMARY, 'en', 'Arial', 12)
+        with tempfile.TemporaryDirectory() as work_dir:
+            docx_path = os.path.join(work_dir, 'summary.docx')
+            pdf_path = os.path.join(work_dir, 'summary.pdf')
+            with open(docx_path, 'wb') as f:
+                f.write(docx_data)
+            for converter in ('docx2pdf', 'comtypes', 'libreoffice'):
+                try:
+                    if convert_docx_to_pdf(docx_path, pdf_path, converter):
+                        with open(pdf_path, 'rb') as f:
+                            return f.read()
+                except Exception:
+                    pass
+        return create_pdf(title, SAMPLE_SUMMARY, 'en', 'Arial', 12)
+
+    with app.app_context():
+        timings, data = timeit(legacy_cascade, args.runs)
+        report('legacy cascade', timings, f"{len(data)} bytes")
+        timings, data = timeit(lambda: render_pdf_export(title, SAMPLE_SUMMARY, 'en', 'Arial', 12, renderer='native'), args.runs)
+        report('native create_pdf', timings, f"{len(data)} bytes")
+        if office_pool.available:
+            # The first conversion starts the workers; time only warm conversions
+            render_pdf_export(title, SAMPLE_SUMMARY, 'en', 'Arial', 12, renderer='docx')
+            timings, data = timeit(lambda: render_pdf_export(title, SAMPLE_SUMMARY, 'en', 'Arial', 12, renderer='docx'), args.runs)
+            report('warm office pool', timings, f"{len(data)} bytes")
+            office_pool.shutdown()
+
+
+def bench_report(args):
+    from app import app, build_docx_report, build_pdf_report
+
+    def sections(count):
+        # Generated lazily, like the batched database reads in export_report
+        for i in range(count):
+            yield i, f"Summary {i}", ' '.join(
+                f"Sentence {j} of summary {i} restates one of its main points." for j in range(12))
+
+    with app.app_context():
+        for name, builder in (('docx', build_docx_report), ('pdf', build_pdf_report)):
+            for count in (25, 50, 100, 200):
+                entries = [(i, f"Summary {i}") for i in range(count)]
+                timings, data = timeit(
+                    lambda: builder('Benchmark report', entries, sections(count), 'Arial', 12, 'bullet'), args.runs)
+                # Linear growth shows up as a flat per-section cost
+                report(f"{name} report x{count}", timings,
+                       f"{statistics.mean(timings) / count * 1000:6.2f} ms/section  {len(data)} bytes")
+
+
+# Messages and the intent the original if/elif chain in chatbot_responses chose
+# for them (None = default reply); quirks such as 'hi' matching inside 'this'
+# are intentional, the compiled matcher has to keep them
+CHATBOT_CORPUS = [
+    ('Hello!', 'greeting'),
+    ('hey there', 'greeting'),
+    ('How are you today?', 'how_are_you'),
+    ('Thanks a lot', 'thanks'),
+    ('ok bye', 'goodbye'),
+    ('Nice to meet you', 'nice_to_meet_you'),
+    ('I need help', 'help'),
+    ('What can you do?', 'capabilities'),
+    ('getting started guide', 'getting_started'),
+    ('What does the compression ratio mean?', 'compression_ratio'),
+    ('Can I export to Word?', 'export'),
+    ('How do I download my summary', 'export'),
+    ('Can you show me the views?', 'views'),
+    ('What is the ROUGE score?', 'rouge_score'),
+    ('keyword extraction please', 'keywords'),
+    ('Which language do you support?', 'greeting'),
+    ('What algorithm do you use?', 'how_it_works'),
+    ('how does it work', 'how_it_works'),
+    ('Summarize a youtube video', 'youtube'),
+    ('Can I upload a PDF?', 'file_upload'),
+    ('summarize a website url', 'url'),
+    ('direct input mode', 'text_input'),
+    ('How do I register an account?', 'account'),
+    ('What does premium cost?', 'pricing'),
+    ('bullet view', 'views'),
+    ('paragraph mode', 'paragraph_view'),
+    ('plain view', 'views'),
+    ('word count', 'summary_metrics'),
+    ('readability', 'readability'),
+    ('analytics dashboard', 'analytics'),
+    ('sentiment analysis', 'sentiment_analysis'),
+    ('custom dictionaries', 'custom_dictionaries'),
+    ('batch processing', 'batch_processing'),
+    ('I got an error', 'troubleshooting'),
+    ('I exceed my limit', 'limit_exceeded'),
+    ('it is so slow', 'slow'),
+    ('who are you', 'about_assistant'),
+    ("what's your name", 'about_assistant'),
+    ('who made this', 'greeting'),
+    ('privacy of my data', 'privacy'),
+    ('do you offer an api', 'integrations'),
+    ('Tell me about zebras', None),
+    ('qwerty', None),
+    ('', None),
+    ('Does it work offline?', None),
+    ('This is great', 'greeting'),
+    ('Xyz qqq zzz mmm ooo', None),
+]
+
+
+def bench_chatbot(args):
+    import chatbot_responses
+
+    mismatches = []
+    for message, expected in CHATBOT_CORPUS:
+        intent = chatbot_responses.get_intent(message)
+        name = intent['name'] if intent else None
+        if name != expected:
+            mismatches.append((message, expected, name))
+    for message, expected, name in mismatches:
+        print(f"MISMATCH {message!r}: expected {expected}, got {name}")
+    print(f"{len(CHATBOT_CORPUS) - len(mismatches)}/{len(CHATBOT_CORPUS)} corpus messages match")
+
+    fallthrough = [message for message, expected in CHATBOT_CORPUS if expected is None]
+    for name, messages in (('whole corpus', [m for m, _ in CHATBOT_CORPUS]), ('default replies', fallthrough)):
+        messages = messages * 200
+        timings, _ = timeit(lambda: [chatbot_responses.get_response(m) for m in messages], args.runs)
+        per_message = statistics.mean(timings) / len(messages)
+        report(f"get_response {name}", timings, f"{per_message * 1e6:6.2f} us/message")
+
+    # Retrieval cost without the result cache, i.e. for messages never seen before
+    questions = ['translate my summary into spanish', 'how many summaries per day can I make',
+                 'can I summarize a podcast transcript', 'Tell me about zebras'] * 500
+
+    def uncached():
+        for message in questions:
+            chatbot_responses._retrieve.cache_clear()
+            chatbot_responses.retrieve_intent(message)
+
+    timings, _ = timeit(uncached, args.runs)
+    report('retrieve_intent uncached', timings, f"{statistics.mean(timings) / len(questions) * 1e6:6.2f} us/message")
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+BENCH_STOP_WORDS = {'the', 'a', 'of', 'and', 'to', 'in', 'is', 'that', 'for', 'it', 'with', 'as', 'on', 'was'}
+
+
+def synthetic_document(sentences, seed=0):
+    """Tokenized sentences drawn from a few topics of unequal size, like a real article."""
+    rng = random.Random(seed)
+    topics = [[f"t{topic}w{word}" for word in range(150)] for topic in range(6)]
+    shared = [f"common{word}" for word in range(400)]
+    stop_words = sorted(BENCH_STOP_WORDS)
+    document = []
+    for _ in range(sentences):
+        topic = topics[min(int(rng.expovariate(0.8)), len(topics) - 1)]
+        tokens = []
+        for _ in range(rng.randint(8, 25)):
+            draw = rng.random()
+            if draw < 0.35:
+                tokens.append(rng.choice(stop_words))
+            elif draw < 0.75:
+                tokens.append(topic[min(int(rng.paretovariate(1.2)) - 1, len(topic) - 1)])
+            else:
+                tokens.append(rng.choice(shared))
+        document.append(tokens + ['.'])
+    return document
+
+
+def interned(document):
+    from vocabulary import InternedDocument
+    return InternedDocument.from_tokens(document, BENCH_STOP_WORDS)
+
+
+def legacy_textrank(sentence_tokens, weights, stop_words):
+    # The original per-pair implementation, kept as the reference for agreement
+    import networkx as nx
+    import numpy as np
+    from nltk.cluster.util import cosine_distance
+
+    def sentence_similarity(sent1, sent2):
+        all_words = list(set(sent1 + sent2))
+        vector1 = [0] * len(all_words)
+        vector2 = [0] * len(all_words)
+        for w in sent1:
+            if w not in stop_words:
+                vector1[all_words.index(w)] += 1
+        for w in sent2:
+            if w not in stop_words:
+                vector2[all_words.index(w)] += 1
+        return 1 - cosine_distance(vector1, vector2)
+
+    n = len(sentence_tokens)
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                matrix[i][j] = sentence_similarity(sentence_tokens[i], sentence_tokens[j])
+    scores = nx.pagerank(nx.from_numpy_array(matrix), personalization=dict(enumerate(weights)))
+    return [scores[i] for i in range(n)]
+
+
+def top_k(scores, k):
+    return set(sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k])
+
+
+RANKER_LATENCY_TARGET = 0.1  # seconds of ranking per request
+
+
+def bench_rankers(args):
+    import rankers
+
+    document = synthetic_document(150, seed=1)
+    weights = [1] * len(document)
+    k = len(document) // 5
+    timings, legacy = timeit(lambda: legacy_textrank(document, weights, BENCH_STOP_WORDS), 1)
+    report('original textrank x150', timings)
+    timings, current = timeit(lambda: rankers.textrank(interned(document), weights), args.runs)
+    report('textrank x150', timings)
+    agree = len(top_k(legacy, k) & top_k(current, k))
+    print(f"textrank vs original implementation: {agree}/{k} selected sentences agree")
+
+    for size in (30, 300, 3000):
+        document = interned(synthetic_document(size, seed=size))
+        weights = [1] * size
+        k = max(1, size // 5)
+        reference = top_k(rankers.textrank(document, weights), k)
+        results = []
+        for name in sorted(rankers.RANKERS):
+            ranker = rankers.RANKERS[name]
+            timings, scores = timeit(lambda: ranker(document, weights), args.runs)
+            agreement = len(top_k(scores, k) & reference) / k
+            results.append((statistics.mean(timings), name, agreement))
+            report(f"{name} x{size}", timings, f"agreement with textrank {agreement:5.1%}")
+        # The ranker closest to TextRank among those fast enough for an interactive request
+        fast_enough = [r for r in results if r[0] <= RANKER_LATENCY_TARGET] or [min(results)]
+        seconds, best, agreement = max(fast_enough, key=lambda r: (r[2], -r[0]))
+        print(f"  recommended at {size} sentences: {best} "
+              f"({seconds * 1000:.1f} ms, {agreement:.0%} agreement with textrank)")
+
+
+def bench_planner(args):
+    import planner
+    import rankers
+
+    # A fresh planner per budget, so every prediction starts from the default costs
+    for size in (100, 1000, 3000, 8000, 20000):
+        document = interned(synthetic_document(size, seed=size))
+        weights = [1] * size
+        k = max(1, size // 5)
+        features = planner.document_features(document)
+        reference = top_k(rankers.textrank(document, weights), k) if size <= 3000 else None
+        for budget in (0.02, 0.2, 2.0):
+            size_planner = planner.Planner()
+            plan = size_planner.plan(features, budget)
+            ranker = rankers.RANKERS[plan.ranker]
+            timings, scores = timeit(lambda: ranker(document, weights), args.runs)
+            for seconds in timings:
+                size_planner.observe(plan, seconds)
+            agreement = f"{len(top_k(scores, k) & reference) / k:5.1%}" if reference else '    -'
+            report(f"x{size} budget {budget * 1000:.0f} ms", timings,
+                   f"{plan.strategy:<12} predicted {plan.predicted_seconds * 1000:8.1f} ms  agreement {agreement}")
+
+
+def bench_pagerank(args):
+    import rankers
+
+    for size in (100, 1000, 5000):
+        document = interned(synthetic_document(size, seed=size))
+        weights = [1] * size
+        similarity = rankers.cosine_similarity_matrix(rankers.term_matrix(document))
+        full_stats = {}
+        timings, full = timeit(lambda: rankers.pagerank(similarity, weights, stats=full_stats), args.runs)
+        report(f"x{size} until tolerance", timings, f"{full_stats['iterations']:3d} iterations")
+        for k in (5, max(5, size // 5)):
+            early_stats = {}
+            timings, early = timeit(
+                lambda: rankers.pagerank(similarity, weights, top_k=k, stats=early_stats), args.runs)
+            agreement = len(top_k(full, k) & top_k(early, k)) / k
+            report(f"x{size} top {k} stable", timings,
+                   f"{early_stats['iterations']:3d} iterations  agreement {agreement:5.1%}")
+
+
+def peak_memory(func):
+    # NumPy and SciPy buffers are reported to tracemalloc, so the peak covers them
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        return tracemalloc.get_traced_memory()[1], elapsed, result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(args):
+    import rankers
+
+    def full_product(counts):
+        # How the graph was built before: one float64 product holding every pair
+        normalized = rankers.normalize_rows(counts)
+        similarity = (normalized @ normalized.T).tocsr()
+        similarity.setdiag(0)
+        similarity.eliminate_zeros()
+        return similarity
+
+    default_limit = rankers.SIMILARITY_MEMORY_LIMIT
+    try:
+        for size in (1000, 4000, 12000):
+            document = interned(synthetic_document(size, seed=size))
+            weights = [1] * size
+            counts = rankers.term_matrix(document)
+            variants = [('full product', lambda: full_product(counts))] if size <= 4000 else []
+            variants += [(f"tiles, ceiling {limit // 2 ** 20} MB", limit)
+                         for limit in (256 * 2 ** 20, 64 * 2 ** 20)]
+            for name, variant in variants:
+                if callable(variant):
+                    peak, elapsed, graph = peak_memory(variant)
+                else:
+                    rankers.SIMILARITY_MEMORY_LIMIT = variant
+                    peak, elapsed, graph = peak_memory(lambda: rankers.cosine_similarity_matrix(counts))
+                print(f"x{size:<6} {name:<24} peak {peak / 2 ** 20:8.1f} MB   {elapsed * 1000:8.1f} ms   "
+                      f"{graph.nnz} edges")
+            rankers.SIMILARITY_MEMORY_LIMIT = 64 * 2 ** 20
+            peak, elapsed, _ = peak_memory(lambda: rankers.textrank(document, weights))
+            print(f"x{size:<6} {'textrank, ceiling 64 MB':<24} peak {peak / 2 ** 20:8.1f} MB   {elapsed * 1000:8.1f} ms")
+            rankers.SIMILARITY_MEMORY_LIMIT = default_limit
+    finally:
+        rankers.SIMILARITY_MEMORY_LIMIT = default_limit
+
+
+def bench_tokens(args):
+    from vocabulary import InternedDocument
+
+    def retained(func):
+        # Memory still held by the result once it is built, and the peak while building it
+        tracemalloc.start()
+        try:
+            result = func()
+            current, peak = tracemalloc.get_traced_memory()
+            return current, peak, result
+        finally:
+            tracemalloc.stop()
+
+    for size in (1000, 10000, 50000):
+        sentences = [' '.join(tokens) for tokens in synthetic_document(size, seed=size)]
+        variants = [
+            ('list of str lists', lambda: [sentence.lower().split() for sentence in sentences]),
+            ('interned int32', lambda: InternedDocument.from_sentences(
+                sentences, lambda sentence: sentence.lower().split(), BENCH_STOP_WORDS)),
+        ]
+        for name, variant in variants:
+            held, peak, _ = retained(variant)
+            timings, _ = timeit(variant, args.runs)
+            report(f"x{size} {name}", timings, f"holds {held / 2 ** 20:7.2f} MB  peak {peak / 2 ** 20:7.2f} MB")
+
+
+def respell(document, seed=0):
+    """The document with every content word replaced by a random string of letters, as
+    synthetic_document's words share most of their characters with each other."""
+    rng = random.Random(seed)
+    spellings = {}
+    for tokens in document:
+        for token in tokens:
+            if token not in spellings:
+                spellings[token] = token if token in BENCH_STOP_WORDS or not token.isalnum() else ''.join(
+                    rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10)))
+    return [[spellings[token] for token in tokens] for tokens in document]
+
+
+def unsegmented(document, seed=0):
+    """The document as a tokenizer sees unspaced scripts: runs of 2-4 content words glued into one token."""
+    rng = random.Random(seed)
+    glued = []
+    for tokens in document:
+        words = [token for token in tokens if token not in BENCH_STOP_WORDS and token.isalnum()]
+        chunks = []
+        while words:
+            length = rng.randint(2, 4)
+            chunks.append(''.join(words[:length]))
+            words = words[length:]
+        glued.append(chunks + ['.'])
+    return glued
+
+
+def bench_embeddings(args):
+    import rankers
+
+    for size in (300, 3000):
+        document = respell(synthetic_document(size, seed=size), seed=size)
+        weights = [1] * size
+        k = max(1, size // 5)
+        exact = interned(document)
+        timings, scores = timeit(lambda: rankers.textrank(exact, weights), args.runs)
+        reference = top_k(scores, k)
+        report(f"x{size} textrank", timings)
+        timings, scores = timeit(lambda: rankers.embedding_textrank(exact, weights), args.runs)
+        report(f"x{size} embedding_textrank", timings, f"agreement with textrank {len(top_k(scores, k) & reference) / k:5.1%}")
+
+        # The same sentences without word boundaries, scored against textrank on the spaced text
+        glued = interned(unsegmented(document, seed=size))
+        for name in ('textrank', 'embedding_textrank', 'frequency'):
+            ranker = rankers.RANKERS[name]
+            timings, scores = timeit(lambda: ranker(glued, weights), args.runs)
+            report(f"x{size} unsegmented {name}", timings,
+                   f"agreement with textrank {len(top_k(scores, k) & reference) / k:5.1%}")
+
+
+def bench_incremental(args):
+    import incremental
+    import rankers
+
+    size = 5000
+    rng = random.Random(size)
+    document = synthetic_document(size, seed=size)
+    for share in (0.002, 0.01, 0.05):
+        # Replace a share of the sentences and delete as many, as a user fixing pasted text would
+        edited = list(document)
+        for i in rng.sample(range(size), int(size * share)):
+            edited[i] = synthetic_document(1, seed=rng.randrange(10 ** 9))[0]
+        del edited[:int(size * share)]
+        weights = [1] * len(edited)
+        k = len(edited) // 5
+
+        timings, scratch = timeit(lambda: rankers.textrank(interned(edited), weights, top_k=k), args.runs)
+        report(f"x{size} {share:.1%} edited, from scratch", timings)
+        incremental_timings = []
+        for _ in range(args.runs):
+            cache = incremental.AnalysisCache()
+            cache.textrank('user', [' '.join(tokens) for tokens in document], interned(document), [1] * size)
+            start = time.perf_counter()
+            scores = cache.textrank('user', [' '.join(tokens) for tokens in edited], interned(edited), weights, top_k=k)
+            incremental_timings.append(time.perf_counter() - start)
+        report(f"x{size} {share:.1%} edited, incremental", incremental_timings,
+               f"agreement {len(top_k(scores, k) & top_k(scratch, k)) / k:5.1%}")
+
+
+def bench_parallel(args):
+    import rankers
+
+    cores = os.cpu_count() or 1
+    print(f"{cores} CPU core(s) available")
+    for size in (4000, 10000):
+        document = interned(synthetic_document(size, seed=size))
+        normalized = rankers.normalize_rows(rankers.term_matrix(document))
+        baseline = None
+        for workers in range(1, max(cores, 2) + 1):
+            # Start the pool outside the timed runs; spawning workers is a one-off cost
+            rankers.blockwise_similarity(normalized[:rankers.PARALLEL_MIN_SENTENCES], top_k=50, workers=workers)
+            timings, _ = timeit(lambda: rankers.blockwise_similarity(normalized, top_k=50, workers=workers), args.runs)
+            baseline = baseline or statistics.mean(timings)
+            report(f"x{size} {workers} worker(s)", timings, f"speed-up {baseline / statistics.mean(timings):4.2f}x")
+
+
+BENCHMARKS = {
+    'export-pdf': bench_export_pdf,
+    'report': bench_report,
+    'chatbot': bench_chatbot,
+    'rankers': bench_rankers,
+    'planner': bench_planner,
+    'pagerank': bench_pagerank,
+    'memory': bench_memory,
+    'parallel': bench_parallel,
+    'tokens': bench_tokens,
+    'embeddings': bench_embeddings,
+    'incremental': bench_incremental,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TextSummarizer benchmarks')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--runs', type=int, default=5, help='repetitions per variant')
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Bulk summarization for the TextSummarizer application.
+Summarizes every TXT, PDF and DOCX file under a directory with the summarizer the
+web app uses, but without Flask, sessions or the database, spreading the files
+over one process per core. Each file's summary, metrics and timings are appended
+to a JSONL file as soon as it is done. Running the command again with the same
+output skips files whose content was already summarized with the same options,
+so an interrupted run resumes where it stopped.
+
+Usage:
+    python bulk_summarize.py INPUT_DIR OUTPUT.jsonl [--compression PERCENT] [--ranker NAME]
+                             [--budget SECONDS] [--time-limit SECONDS] [--workers N]
+
+By default every file is ranked with the exact TextRank ranker run to
+convergence, so summarizing the same input again gives the same records. The
+'auto' ranker, whose choice follows the measured speed of this machine, and a
+PageRank time limit are opt-in.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+import planner
+import rankers
+import summarizer
+
+HASH_CHUNK = 1024 * 1024  # bytes read at a time when hashing a file
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_files(root):
+    """Paths of the supported files under root, in a stable order."""
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if '.' in filename and filename.rsplit('.', 1)[1].lower() in summarizer.SUPPORTED_EXTENSIONS:
+                yield os.path.join(directory, filename)
+
+
+def load_done(output_path, options):
+    """
+    Content hashes already summarized with these options by earlier runs.
+
+    Failed files, and copies of them, are not counted, so they are retried. Lines
+    that are not valid records, such as one cut short when a run was killed, are
+    ignored.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or record.get('options') != options:
+                continue
+            if record.get('status') in ('ok', 'empty'):
+                done.add(record.get('sha256'))
+    return done
+
+
+def init_worker():
+    # Files are already spread over every core, so rankers must not start a pool of their own
+    rankers.SIMILARITY_WORKERS = 1
+
+
+def summarize_file(task):
+    """
+    Summarize one file in a worker process.
+
+    Args:
+        task (tuple): (path, sha256, options)
+
+    Returns:
+        dict: The file's JSONL record; 'status' is 'ok', 'empty' or 'error'
+    """
+    path, sha256, options = task
+    record = {'path': path, 'sha256': sha256, 'options': options, 'status': 'ok'}
+    started = time.perf_counter()
+    try:
+        text = summarizer.extract_text_from_path(path)
+        extracted = time.perf_counter()
+        if not text.strip():
+            record['status'] = 'empty'
+            record['timings'] = {'extract_seconds': extracted - started}
+            return record
+
+        stats = {}
+        num_sentences = summarizer.summary_length(text, options['compression'] / 100)
+        summary_text = summarizer.generate_summary(text, num_sentences, stats=stats, ranker=options['ranker'],
+                                                   budget=options['budget'], time_limit=options['time_limit'])
+        summarized = time.perf_counter()
+        record['summary'] = summary_text
+        record['metrics'] = {
+            'word_count': len(word_tokenize(summary_text)),
+            'sentence_count': len(sent_tokenize(summary_text)),
+            'compression_ratio': summarizer.calculate_compression_ratio(text, summary_text),
+            'rouge_score': summarizer.calculate_rouge_score(text, summary_text),
+            'duplicates_removed': stats.get('duplicates_removed', 0),
+            'ranker': stats.get('ranker'),
+            'ranking_strategy': stats.get('strategy'),
+            'ranking_seconds': stats.get('ranking_seconds'),
+            'ranking_converged': stats.get('converged', True),
+            'ranking_iterations': stats.get('iterations', 0)
+        }
+        record['timings'] = {
+            'extract_seconds': extracted - started,
+            'summarize_seconds': summarized - extracted,
+            'total_seconds': time.perf_counter() - started
+        }
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+        record['timings'] = {'total_seconds': time.perf_counter() - started}
+    return record
+
+
+def write_record(output, record):
+    output.write(json.dumps(record, ensure_ascii=False) + '\n')
+    output.flush()
+
+
+def run(input_dir, output_path, options, workers=None):
+    """
+    Summarize the new files under input_dir into output_path.
+
+    Returns:
+        dict: Count of the files by status, plus 'skipped' (already in the output)
+        and 'duplicate' (same content as another file of this run)
+    """
+    done = load_done(output_path, options)
+    counts = {'ok': 0, 'empty': 0, 'error': 0, 'skipped': 0, 'duplicate': 0}
+
+    with open(output_path, 'a', encoding='utf-8') as output:
+        # Hash in this process so resumed and repeated content is never sent to a worker
+        tasks = []
+        first_path = {}
+        for path in find_files(input_dir):
+            try:
+                sha256 = file_digest(path)
+            except OSError as e:
+                write_record(output, {'path': path, 'sha256': None, 'options': options, 'status': 'error',
+                                      'error': f"{type(e).__name__}: {e}"})
+                counts['error'] += 1
+                continue
+            if sha256 in done:
+                counts['skipped'] += 1
+            elif sha256 in first_path:
+                write_record(output, {'path': path, 'sha256': sha256, 'options': options, 'status': 'duplicate',
+                                      'duplicate_of': first_path[sha256]})
+                counts['duplicate'] += 1
+            else:
+                first_path[sha256] = path
+                tasks.append((path, sha256, options))
+
+        print(f"{len(tasks)} file(s) to summarize, {counts['skipped']} already done, "
+              f"{counts['duplicate']} duplicate(s)", file=sys.stderr)
+        if not tasks:
+            return counts
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+        with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+            for finished, record in enumerate(pool.imap_unordered(summarize_file, tasks), 1):
+                write_record(output, record)
+                counts[record['status']] += 1
+                print(f"[{finished}/{len(tasks)}] {record['status']:<5} {record['path']}", file=sys.stderr)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize every TXT, PDF and DOCX file under a directory into JSONL')
+    parser.add_argument('input_dir')
+    parser.add_argument('output', help='JSONL file the records are appended to')
+    parser.add_argument('--compression', type=float, default=50,
+                        help='percentage of the sentences to remove, as on the summarize page')
+    parser.add_argument('--ranker', default=rankers.DEFAULT_RANKER, choices=['auto'] + sorted(rankers.RANKERS))
+    parser.add_argument('--budget', type=float, default=None,
+                        help=f"seconds of ranking the 'auto' ranker plans for, e.g. {planner.LATENCY_BUDGET:g} "
+                             "as in the web app; default no limit")
+    parser.add_argument('--time-limit', type=float, default=None,
+                        help='seconds after which PageRank returns its ranking so far; default run to convergence')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per CPU core')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"not a directory: {args.input_dir}")
+
+    summarizer.download_nltk_resources()
+    options = {'compression': args.compression, 'ranker': args.ranker, 'budget': args.budget,
+               'time_limit': args.time_limit}
+    started = time.perf_counter()
+    counts = run(args.input_dir, args.output, options, args.workers)
+    print(', '.join(f"{count} {status}" for status, count in counts.items())
+          + f" in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Document conversion workers for the TextSummarizer application.
+Keeps headless LibreOffice processes running behind local UNO sockets, so a
+DOCX-to-PDF export costs only the conversion instead of an office start-up.
+Requires the `soffice`/`libreoffice` binary and its Python UNO bindings; when
+either is missing the pool reports itself unavailable and callers fall back to
+native PDF rendering.
+"""
+
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+POOL_SIZE = 2
+CONVERT_TIMEOUT = 60.0  # seconds before a stuck conversion is killed
+QUEUE_TIMEOUT = 30.0  # seconds a request waits for a free worker
+STARTUP_TIMEOUT = 30.0  # seconds a new office process gets to open its socket
+HEALTH_CHECK_INTERVAL = 30.0
+
+
+class ConversionUnavailable(Exception):
+    """Raised when no office converter can take the request."""
+
+
+def find_office_binary():
+    return shutil.which('soffice') or shutil.which('libreoffice')
+
+
+def office_available():
+    if not find_office_binary():
+        return False
+    try:
+        import uno  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _property(name, value):
+    from com.sun.star.beans import PropertyValue
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class OfficeWorker:
+    """One headless office process and the UNO connection to it."""
+
+    def __init__(self, binary):
+        self.binary = binary
+        self.process = None
+        self.desktop = None
+        self.port = None
+        self.profile_dir = None
+        self.conversions = 0
+        self.restarts = 0
+
+    def start(self):
+        self.port = _free_port()
+        # Each process needs its own profile, or they fight over the lock file
+        self.profile_dir = tempfile.mkdtemp(prefix='summarizer-office-')
+        self.process = subprocess.Popen([
+            self.binary, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+            f'-env:UserInstallation=file://{self.profile_dir}',
+            f'--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext',
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.desktop = self._connect()
+
+    def _connect(self):
+        import uno
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f'uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext')
+                return context.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', context)
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise ConversionUnavailable('Office process did not start')
+                time.sleep(0.25)
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        self.desktop = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def is_healthy(self):
+        if self.process is None or self.process.poll() is not None or self.desktop is None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, docx_path, pdf_path, timeout=CONVERT_TIMEOUT):
+        import uno
+        # UNO calls cannot be interrupted, so a stuck conversion is ended by
+        # killing the process; the worker is restarted by the pool afterwards
+        watchdog = threading.Timer(timeout, self.stop)
+        watchdog.start()
+        try:
+            document = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(os.path.abspath(docx_path)), '_blank', 0,
+                (_property('Hidden', True),))
+            try:
+                document.storeToURL(
+                    uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+                    (_property('FilterName', 'writer_pdf_Export'),))
+            finally:
+                document.close(True)
+            self.conversions += 1
+        finally:
+            watchdog.cancel()
+
+
+class ConverterPool:
+    """
+    Bounded pool of warm office workers with a request queue.
+
+    At most `size` conversions run at once; further requests wait up to
+    queue_timeout for a worker. Workers are started on first use, checked
+    periodically while idle, and restarted when they crash or a conversion fails.
+
+    Args:
+        size (int): Number of office processes, i.e. the concurrency limit
+        convert_timeout (float): Seconds before a conversion is abandoned
+        queue_timeout (float): Seconds a request may wait for a free worker
+    """
+
+    def __init__(self, size=POOL_SIZE, convert_timeout=CONVERT_TIMEOUT, queue_timeout=QUEUE_TIMEOUT):
+        self.size = size
+        self.convert_timeout = convert_timeout
+        self.queue_timeout = queue_timeout
+        self.binary = find_office_binary()
+        self.available = office_available()
+        self.workers = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self.waiting = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def _ensure_started(self):
+        # Started lazily so each server process gets its own workers after forking
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                worker = OfficeWorker(self.binary)
+                try:
+                    worker.start()
+                except Exception as e:
+                    print(f"Office worker failed to start: {e}")
+                self.workers.append(worker)
+                self._idle.put(worker)
+            self._started = True
+            threading.Thread(target=self._health_loop, daemon=True).start()
+
+    def _health_loop(self):
+        while True:
+            time.sleep(HEALTH_CHECK_INTERVAL)
+            for _ in range(self._idle.qsize()):
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                self._revive(worker)
+                self._idle.put(worker)
+
+    def _revive(self, worker):
+        if not worker.is_healthy():
+            try:
+                worker.restart()
+            except Exception as e:
+                print(f"Office worker restart failed: {e}")
+
+    def convert(self, docx_path, pdf_path):
+        """Convert a DOCX file to PDF on a warm worker; raises ConversionUnavailable if none is usable."""
+        if not self.available:
+            raise ConversionUnavailable('No office converter installed')
+        self._ensure_started()
+
+        with self._lock:
+            self.waiting += 1
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            self.rejected += 1
+            raise ConversionUnavailable('All office workers are busy')
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        try:
+            self._revive(worker)
+            if not worker.is_healthy():
+                raise ConversionUnavailable('Office worker is not running')
+            worker.convert(docx_path, pdf_path, self.convert_timeout)
+            return os.path.exists(pdf_path)
+        except Exception:
+            self.failures += 1
+            self._revive(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.stop()
+
+    def snapshot(self):
+        return {
+            'available': self.available,
+            'size': self.size,
+            'started': self._started,
+            'idle': self._idle.qsize(),
+            'waiting': self.waiting,
+            'healthy': sum(1 for worker in self.workers if worker.process is not None and worker.process.poll() is None),
+            'conversions': sum(worker.conversions for worker in self.workers),
+            'restarts': sum(worker.restarts for worker in self.workers),
+            'failures': self.failures,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,112 @@
+"""
+Near-duplicate sentence detection for the TextSummarizer application.
+Scraped pages and video transcripts often repeat the same sentence (menus,
+"subscribe" lines, repeated captions). Collapsing the copies before ranking keeps
+the similarity matrix small and stops duplicates from reinforcing each other.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+SIMHASH_BITS = 64
+MAX_HAMMING_DISTANCE = 3
+# Below this many features a SimHash is too coarse; such sentences are only
+# collapsed when their normalized text is identical
+MIN_FEATURES = 4
+
+_NON_WORD = re.compile(r'[^\w\s]')
+# Four 16-bit bands: two fingerprints within 3 bits of each other must agree on
+# at least one band (pigeonhole), so only sentences sharing a band are compared
+_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // _BANDS
+
+
+def normalize_sentence(sentence):
+    return ' '.join(_NON_WORD.sub(' ', sentence.lower()).split())
+
+
+def sentence_features(normalized):
+    words = normalized.split()
+    # Scripts written without spaces (CJK) come out as one long "word"; use
+    # character bigrams for those instead
+    if len(words) <= 2 and len(normalized) > 8:
+        text = normalized.replace(' ', '')
+        return [text[i:i + 2] for i in range(len(text) - 1)]
+    return words
+
+
+@lru_cache(maxsize=65536)
+def feature_hash(feature):
+    # A fixed digest rather than hash(), which is salted per process, so the same
+    # text gets the same fingerprints in every worker and after every restart
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=SIMHASH_BITS // 8).digest(), 'big')
+
+
+def simhash(features):
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def collapse_duplicates(sentences, max_distance=MAX_HAMMING_DISTANCE):
+    """
+    Group exact and near-duplicate sentences.
+
+    Args:
+        sentences (list): Sentences in document order
+        max_distance (int): Largest SimHash Hamming distance treated as a duplicate
+
+    Returns:
+        tuple: (representatives, weights) where representatives holds the original
+        index of the first sentence of each group, in document order, and
+        weights holds the number of sentences collapsed into each group
+    """
+    group_of = {}  # normalized text -> group number
+    representatives = []
+    weights = []
+    fingerprints = []
+    buckets = defaultdict(list)
+
+    for index, sentence in enumerate(sentences):
+        normalized = normalize_sentence(sentence)
+        group = group_of.get(normalized)
+
+        if group is None:
+            features = sentence_features(normalized)
+            fingerprint = None
+            if len(features) >= MIN_FEATURES:
+                fingerprint = simhash(features)
+                bands = [(b, fingerprint >> (b * _BAND_BITS) & ((1 << _BAND_BITS) - 1)) for b in range(_BANDS)]
+                for band in bands:
+                    for candidate in buckets.get(band, ()):
+                        if bin(fingerprint ^ fingerprints[candidate]).count('1') <= max_distance:
+                            group = candidate
+                            break
+                    if group is not None:
+                        break
+
+            if group is None:
+                group = len(representatives)
+                representatives.append(index)
+                weights.append(0)
+                fingerprints.append(fingerprint)
+                if fingerprint is not None:
+                    for band in bands:
+                        buckets[band].append(group)
+            group_of[normalized] = group
+
+        weights[group] += 1
+
+    return representatives, weights
@@ -0,0 +1,132 @@
+"""
+Export cache for the TextSummarizer application.
+Rendered TXT/DOCX/PDF exports are kept by a hash of everything that affects the
+output, so downloading the same summary again is served from memory (or from a
+bounded on-disk cache) instead of being rendered again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+MEMORY_LIMIT = 64 * 1024 * 1024  # bytes of rendered exports kept in memory
+DISK_LIMIT = 512 * 1024 * 1024  # bytes of rendered exports kept on disk
+
+
+def make_key(**fields):
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ExportCache:
+    """
+    Two-level LRU cache of rendered exports.
+
+    Args:
+        memory_limit (int): Maximum total size in bytes of entries held in memory
+        disk_dir (str): Directory for the second level, or None for memory only
+        disk_limit (int): Maximum total size in bytes of files kept in disk_dir
+    """
+
+    def __init__(self, memory_limit=MEMORY_LIMIT, disk_dir=None, disk_limit=DISK_LIMIT):
+        self.memory_limit = memory_limit
+        self.disk_dir = disk_dir
+        self.disk_limit = disk_limit
+        self._entries = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        if data is not None:
+            self.disk_hits += 1
+            self._put_memory(key, data)
+        else:
+            self.misses += 1
+        return data
+
+    def put(self, key, data):
+        self._put_memory(key, data)
+        self._write_disk(key, data)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'memory_bytes': self._memory_size,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+            }
+
+    def _put_memory(self, key, data):
+        if len(data) > self.memory_limit:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._memory_size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_limit:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key)
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used for eviction
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir or len(data) > self.disk_limit:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            print(f"Export cache write error: {e}")
+
+    def _evict_disk(self):
+        files = []
+        total = 0
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        # Oldest (least recently used) first
+        for _, size, path in sorted(files):
+            if total <= self.disk_limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,209 @@
+"""
+Font registry for the TextSummarizer application.
+Fonts in static/fonts are discovered once at startup. Parsed TrueType metrics are
+kept per process, so PDF exports no longer re-read and re-parse large CJK fonts
+on every call, and both the PDF and DOCX exporters resolve fonts through the same
+script-aware fallback chains.
+"""
+
+import copy
+import os
+import threading
+
+# User-facing font names to the family names used for PDF fonts
+PDF_FONT_ALIASES = {
+    'Arial': 'Arial',
+    'Helvetica': 'helvetica',
+    'Times New Roman': 'Times',
+    'Times': 'Times',
+    'Courier New': 'Courier',
+    'Courier': 'Courier',
+    'Verdana': 'Verdana',
+    'Georgia': 'Georgia',
+    'Palatino': 'Palatino',
+    'Garamond': 'Garamond',
+    'Bookman': 'Bookman',
+    'Comic Sans MS': 'ComicSansMS',
+    'Trebuchet MS': 'TrebuchetMS',
+    'Arial Black': 'ArialBlack',
+    'Impact': 'Impact',
+    'Lucida Console': 'LucidaConsole',
+    'Tahoma': 'Tahoma',
+    'Geneva': 'Geneva',
+    'Lucida Sans Unicode': 'LucidaSansUnicode',
+    'Noto Sans': 'NotoSans',
+    'Noto Sans Kannada': 'NotoSansKannada',
+    'Noto Sans CJK': 'NotoSansCJK',
+    'Segoe UI': 'SegoeUI',
+    'Calibri': 'Calibri',
+    'Cambria': 'Cambria',
+}
+
+# Font files looked for in the font directory, by PDF family name
+FONT_FILES = {
+    'Verdana': 'Verdana.ttf',
+    'Georgia': 'Georgia.ttf',
+    'Palatino': 'Palatino.ttf',
+    'Garamond': 'Garamond.ttf',
+    'Bookman': 'Bookman.ttf',
+    'ComicSansMS': 'ComicSansMS.ttf',
+    'TrebuchetMS': 'TrebuchetMS.ttf',
+    'ArialBlack': 'ArialBlack.ttf',
+    'Impact': 'Impact.ttf',
+    'LucidaConsole': 'LucidaConsole.ttf',
+    'Tahoma': 'Tahoma.ttf',
+    'Geneva': 'Geneva.ttf',
+    'LucidaSansUnicode': 'LucidaSansUnicode.ttf',
+    'NotoSans': 'NotoSans-Regular.ttf',
+    'NotoSansKannada': 'NotoSansKannada-Regular.ttf',
+    'NotoSansCJK': 'NotoSansCJK-Regular.ttf',
+    'NotoSansSC': 'NotoSansSC-Regular.ttf',
+    'NotoSansJP': 'NotoSansJP-Regular.ttf',
+    'NotoSansKR': 'NotoSansKR-Regular.ttf',
+    'NotoSansDevanagari': 'NotoSansDevanagari-Regular.ttf',
+    'ArialUnicodeMS': 'ArialUnicodeMS.ttf',
+    'SegoeUI': 'SegoeUI.ttf',
+    'Calibri': 'calibri.ttf',
+    'Cambria': 'cambria.ttf',
+}
+
+# Embedded PDF fonts to try, in order, for scripts the built-in fonts cannot encode
+PDF_SCRIPT_FALLBACKS = {
+    'zh': ['NotoSansCJK', 'NotoSansSC', 'NotoSansJP', 'ArialUnicodeMS'],
+    'ja': ['NotoSansCJK', 'NotoSansJP', 'NotoSansSC', 'ArialUnicodeMS'],
+    'ko': ['NotoSansCJK', 'NotoSansKR', 'ArialUnicodeMS'],
+    'devanagari': ['NotoSansDevanagari', 'ArialUnicodeMS', 'NotoSans'],
+    'kannada': ['NotoSansKannada', 'ArialUnicodeMS'],
+}
+
+# DOCX fonts are rendered by the reader's word processor, so these are the
+# system fonts most likely to cover each script
+DOCX_SCRIPT_FONTS = {
+    'zh': 'SimSun',
+    'ja': 'MS Gothic',
+    'ko': 'Malgun Gothic',
+    'devanagari': 'Arial Unicode MS',
+    'kannada': 'Tunga',
+}
+
+# East Asian scripts need the w:eastAsia font slot set in DOCX runs
+EAST_ASIAN_SCRIPTS = {'zh', 'ja', 'ko'}
+
+
+def detect_script(text, language='en'):
+    """
+    Work out which script needs special font handling.
+
+    Args:
+        text (str): The text that will be rendered
+        language (str): Requested target language code, which takes precedence
+
+    Returns:
+        str: 'zh', 'ja', 'ko', 'devanagari', 'kannada', or None for Latin text
+    """
+    by_language = {
+        'zh-CN': 'zh', 'zh-TW': 'zh', 'ja': 'ja', 'ko': 'ko',
+        'hi': 'devanagari', 'mr': 'devanagari', 'ne': 'devanagari', 'kn': 'kannada',
+    }
+    if language in by_language:
+        return by_language[language]
+    # Kana is checked before Han characters, which Japanese text also contains
+    if any('\u3040' <= char <= '\u30ff' for char in text):
+        return 'ja'
+    elif any('\u4e00' <= char <= '\u9fff' for char in text):
+        return 'zh'
+    elif any('\uac00' <= char <= '\ud7af' for char in text):
+        return 'ko'
+    elif any('\u0900' <= char <= '\u097f' for char in text):
+        return 'devanagari'
+    elif any('\u0c80' <= char <= '\u0cff' for char in text):
+        return 'kannada'
+    return None
+
+
+class FontRegistry:
+    """
+    Fonts available to the exporters, discovered once per process.
+
+    Args:
+        font_dir (str): Directory holding the TrueType files listed in FONT_FILES
+    """
+
+    def __init__(self, font_dir):
+        self.font_dir = font_dir
+        self.available = self.discover()
+        # PDF font entries captured right after the first add_font of each family
+        self._pdf_templates = {}
+        self._lock = threading.Lock()
+
+    def discover(self):
+        available = {}
+        for family, filename in FONT_FILES.items():
+            path = os.path.join(self.font_dir, filename)
+            if os.path.exists(path):
+                available[family] = path
+        return available
+
+    def pdf_font_chain(self, font_style, script=None):
+        """Embedded font families to try for a PDF, best first; empty means use a built-in font."""
+        family = PDF_FONT_ALIASES.get(font_style, font_style)
+        chain = [name for name in PDF_SCRIPT_FALLBACKS.get(script, []) if name in self.available]
+        if family in self.available and family not in chain:
+            chain.append(family)
+        return chain
+
+    def pdf_builtin_family(self, font_style):
+        return PDF_FONT_ALIASES.get(font_style, font_style)
+
+    def docx_font(self, font_style, script=None):
+        return DOCX_SCRIPT_FONTS.get(script, font_style)
+
+    def register_pdf_font(self, pdf, family):
+        """
+        Make an embedded font family usable in this FPDF document.
+
+        The TTF is parsed only the first time a family is used in the process;
+        later documents get a copy of the parsed entry with their own subset.
+        """
+        template = self._pdf_templates.get(family)
+        if template is None:
+            with self._lock:
+                template = self._pdf_templates.get(family)
+                if template is None:
+                    template = self._load_pdf_template(pdf, family)
+                    self._pdf_templates[family] = template
+                    return
+        fonts, font_files = template
+        if fonts is None:
+            # Font objects we do not know how to share; let FPDF load it
+            pdf.add_font(family, '', self.available[family], uni=True)
+            return
+        for key, entry in fonts.items():
+            if key in pdf.fonts:
+                continue
+            # Character widths are read-only and shared; everything else,
+            # including the glyph subset, is per document
+            fresh = {name: (value if name == 'cw' else copy.deepcopy(value)) for name, value in entry.items()}
+            fresh['i'] = len(pdf.fonts) + 1
+            pdf.fonts[key] = fresh
+        for key, entry in font_files.items():
+            pdf.font_files.setdefault(key, copy.deepcopy(entry))
+
+    def _load_pdf_template(self, pdf, family):
+        fonts_before = set(pdf.fonts)
+        files_before = set(getattr(pdf, 'font_files', {}))
+        pdf.add_font(family, '', self.available[family], uni=True)
+        fonts = {key: pdf.fonts[key] for key in pdf.fonts if key not in fonts_before}
+        if not all(isinstance(entry, dict) for entry in fonts.values()) or not hasattr(pdf, 'font_files'):
+            return None, None
+        # Snapshot before any text is written, so the subset is still empty
+        fonts = {key: {name: (value if name == 'cw' else copy.deepcopy(value)) for name, value in entry.items()}
+                 for key, entry in fonts.items()}
+        font_files = {key: copy.deepcopy(pdf.font_files[key]) for key in pdf.font_files if key not in files_before}
+        return fonts, font_files
+
+    def snapshot(self):
+        return {
+            'available': sorted(self.available),
+            'parsed': sorted(self._pdf_templates),
+        }
@@ -0,0 +1,187 @@
+"""
+Incremental re-summarization for the TextSummarizer application.
+Users often fix a few sentences and submit the text again. The TextRank graph of
+each user's last summary is kept, and a resubmitted text is diffed against it by
+sentence. Similarities between unchanged sentences are read from the kept graph;
+only the rows and columns of inserted or changed sentences are computed, and
+PageRank starts from the previous scores, so it converges in a few steps.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator
+
+import rankers
+
+MEMORY_LIMIT = 256 * 1024 * 1024  # bytes of similarity graphs kept across all users
+MAX_CHANGED_SHARE = 0.3  # share of sentences not in the kept graph above which it is rebuilt
+
+# graph: similarity graph of the version the analysis was last built from scratch for
+# base_index: index in graph of each current sentence, or -1 for sentences added since
+# extra: current sentences x sentences matrix of the edges of the added sentences
+# floor: weakest edge of each graph row that was cut to top_k edges, else 0
+# top_k: edges kept per row of graph, or None for all
+Analysis = namedtuple('Analysis', 'sentences graph base_index extra floor scores top_k')
+
+
+def analysis_size(analysis):
+    return sum(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+               for matrix in (analysis.graph, analysis.extra))
+
+
+def build(vectors, top_k):
+    """Analysis of a document from scratch, with no sentences or scores yet."""
+    n = vectors.shape[0]
+    graph = rankers.blockwise_similarity(vectors, top_k=top_k)
+    lengths = np.diff(graph.indptr)
+    floor = np.zeros(n, dtype=np.float32)
+    if top_k is not None:
+        full = np.flatnonzero(lengths >= top_k)
+        floor[full] = np.minimum.reduceat(graph.data, graph.indptr[full]) if full.size else 0
+    return Analysis(None, graph, np.arange(n), sparse.csr_matrix((n, n), dtype=np.float32), floor, None, top_k)
+
+
+def update(previous, base_index, vectors):
+    """
+    Analysis of an edited document that reuses the graph of a previous version.
+
+    Args:
+        previous (Analysis): Analysis of the previous version
+        base_index (numpy.ndarray): Index in previous.graph of each sentence, or -1 for
+            sentences that are not in it
+        vectors: Sparse sentences x features matrix of the edited document, rows of unit length
+
+    Returns:
+        Analysis: The new analysis, with no sentences or scores yet. Rows cut to
+        top_k keep their edges and gain those of added sentences above their
+        weakest edge, so they may hold a few more than top_k edges
+    """
+    n = vectors.shape[0]
+    vectors = sparse.csr_matrix(vectors, dtype=np.float32)
+    added = np.flatnonzero(base_index < 0)
+    kept = np.flatnonzero(base_index >= 0)
+
+    # Rows of the added sentences against every sentence, without their self-similarity...
+    rows = rankers.blockwise_similarity(vectors[added], vectors, top_k=previous.top_k, zero_diagonal=False).tocoo()
+    keep = added[rows.row] != rows.col
+    # ...and, as the graph is symmetric, their columns in the kept rows
+    columns = (vectors[kept] @ vectors[added].T).tocoo()
+    columns_keep = columns.data >= previous.floor[base_index[kept[columns.row]]]
+    extra = sparse.csr_matrix(
+        (np.concatenate((rows.data[keep], columns.data[columns_keep])),
+         (np.concatenate((added[rows.row[keep]], kept[columns.row[columns_keep]])),
+          np.concatenate((rows.col[keep], added[columns.col[columns_keep]])))),
+        shape=(n, n), dtype=np.float32)
+    return Analysis(None, previous.graph, base_index, extra, previous.floor, None, previous.top_k)
+
+
+def similarity_operator(analysis):
+    """The similarity graph of an analysis as a LinearOperator for rankers.pagerank."""
+    base_index = analysis.base_index
+    n = len(base_index)
+    kept = np.flatnonzero(base_index >= 0)
+    positions = base_index[kept]
+
+    def product(graph, extra):
+        def apply(x):
+            x = np.asarray(x, dtype=float).ravel()
+            spread = np.zeros(graph.shape[1])
+            spread[positions] = x[kept]
+            y = np.asarray(extra @ x, dtype=float).ravel()
+            y[kept] += (graph @ spread)[positions]
+            return y
+        return apply
+
+    return LinearOperator((n, n), matvec=product(analysis.graph, analysis.extra),
+                          rmatvec=product(analysis.graph.T, analysis.extra.T), dtype=float)
+
+
+class AnalysisCache:
+    """
+    LRU cache of the last TextRank analysis of each user.
+
+    Args:
+        memory_limit (int): Maximum total size in bytes of the graphs kept
+        max_changed_share (float): Largest share of sentences added since the graph
+            was built that is still handled incrementally
+    """
+
+    def __init__(self, memory_limit=MEMORY_LIMIT, max_changed_share=MAX_CHANGED_SHARE):
+        self.memory_limit = memory_limit
+        self.max_changed_share = max_changed_share
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.incremental = 0
+        self.full = 0
+
+    def textrank(self, key, sentences, document, weights, stats=None, **pagerank_options):
+        """
+        Rank sentences like rankers.textrank, reusing the analysis last stored under key.
+
+        Args:
+            key: Whose previous version to diff against, e.g. the user id
+            sentences (list): Sentence strings, in the order of document's sentences
+            document (InternedDocument): Token ids of each sentence
+            weights (sequence): Personalization weight of each sentence
+            stats (dict): If given, receives pagerank's stats and 'reused_sentences'
+
+        Returns:
+            numpy.ndarray: Score of each sentence
+        """
+        vectors = rankers.normalize_rows(rankers.term_matrix(document))
+        with self._lock:
+            previous = self._entries.get(key)
+
+        analysis, start = None, None
+        if previous is not None:
+            positions = {sentence: i for i, sentence in enumerate(previous.sentences)}
+            previous_index = np.array([positions.get(sentence, -1) for sentence in sentences], dtype=np.int64)
+            base_index = np.where(previous_index >= 0, previous.base_index[np.maximum(previous_index, 0)], -1)
+            if np.mean(base_index < 0) <= self.max_changed_share:
+                analysis = update(previous, base_index, vectors)
+                # Sentences carry over their previous score; new ones start from the average
+                kept = previous_index >= 0
+                start = np.full(len(sentences), previous.scores.mean())
+                start[kept] = previous.scores[previous_index[kept]]
+        if analysis is None:
+            analysis = build(vectors, rankers.edge_limit(len(sentences)))
+
+        pagerank_stats = {}
+        scores = rankers.pagerank(similarity_operator(analysis), personalization=weights, start=start,
+                                  stats=pagerank_stats, **pagerank_options)
+        if stats is not None:
+            reused = int(np.sum(analysis.base_index >= 0)) if start is not None else 0
+            stats.update(pagerank_stats, reused_sentences=reused)
+        self._put(key, analysis._replace(sentences=list(sentences), scores=scores), incremental=start is not None)
+        return scores
+
+    def _put(self, key, analysis, incremental):
+        size = analysis_size(analysis)
+        with self._lock:
+            if incremental:
+                self.incremental += 1
+            else:
+                self.full += 1
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= analysis_size(previous)
+            if size > self.memory_limit:
+                return
+            self._entries[key] = analysis
+            self._size += size
+            while self._size > self.memory_limit:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= analysis_size(evicted)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'memory_bytes': self._size,
+                'incremental': self.incremental,
+                'full': self.full,
+            }
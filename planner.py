@@ -0,0 +1,150 @@
+"""
+Ranking planner for the TextSummarizer application.
+Predicts how long each ranking strategy will take on a document, from its
+sentence count, vocabulary and per-operation costs, and picks the most accurate
+strategy that fits the request's latency budget. The per-operation costs start
+from measured defaults and follow the times observed on this machine.
+"""
+
+import threading
+from collections import Counter, namedtuple
+
+import numpy as np
+
+import rankers
+
+# Strategies, the ranker that implements each, and their accuracy tier (0 = same
+# ranking as TextRank); sparse_textrank computes the same scores as textrank
+STRATEGIES = [
+    ('exact', 'textrank', 0),
+    ('sparsified', 'sparse_textrank', 0),
+    ('hierarchical', 'hierarchical_textrank', 1),
+    ('linear', 'frequency', 2),
+]
+
+# Seconds per unit of work (see Planner.work), measured with 'benchmarks.py planner'
+DEFAULT_COSTS = {
+    'exact': 2.5e-7,
+    'sparsified': 3.4e-7,
+    'hierarchical': 2.5e-7,
+    'linear': 2.5e-7,
+}
+# A term co-occurrence in a sparse matrix product costs about this many token visits;
+# less for sparse_textrank, whose graph keeps fewer edges for PageRank to visit
+PAIR_WEIGHT = 0.18
+SPARSE_PAIR_WEIGHT = 0.06
+OVERHEAD = 0.002  # seconds every ranking takes regardless of size
+SMOOTHING = 0.2  # weight of each new observation in the running per-operation cost
+LATENCY_BUDGET = 2.0  # seconds of ranking a plan should fit in; a target for choosing, not a stop
+
+Plan = namedtuple('Plan', 'strategy ranker predicted_seconds work')
+
+
+def document_features(document):
+    """
+    Measure what the ranking strategies' running times depend on.
+
+    Args:
+        document (InternedDocument): Token ids of each sentence
+
+    Returns:
+        dict: Sentence, token and vocabulary counts, and the number of term
+        co-occurrences each similarity graph has to compute
+    """
+    sentences = len(document)
+    keep = ~document.stop[document.ids]
+    # One entry per distinct (sentence, term) pair the rankers compare
+    pairs = np.unique(document.rows()[keep].astype(np.int64) * len(document.terms) + document.ids[keep])
+    terms = pairs % len(document.terms)
+    document_frequency = np.bincount(terms)
+    document_frequency = document_frequency[document_frequency > 0]
+    blocks = pairs // len(document.terms) // rankers.HIERARCHY_BLOCK
+    _, block_frequency = np.unique(blocks * len(document.terms) + terms, return_counts=True)
+    candidates = sum(rankers.hierarchy_candidates(min(rankers.HIERARCHY_BLOCK, sentences - start))
+                     for start in range(0, sentences, rankers.HIERARCHY_BLOCK))
+
+    max_df = rankers.max_document_frequency(sentences)
+    squares = document_frequency.astype(np.int64) ** 2
+    return {
+        'sentences': sentences,
+        'tokens': len(document.ids),
+        'vocabulary': len(document_frequency),
+        'pair_work': int(squares.sum()),
+        'sparse_pair_work': int(squares[document_frequency <= max_df].sum()),
+        'block_pair_work': int((block_frequency.astype(np.int64) ** 2).sum()),
+        'candidates': candidates,
+    }
+
+
+class Planner:
+    """
+    Chooses a ranking strategy per document from a latency budget.
+
+    Args:
+        costs (dict): Initial seconds per unit of work for each strategy
+        smoothing (float): Weight of each observed run in the per-operation costs
+    """
+
+    def __init__(self, costs=None, smoothing=SMOOTHING):
+        self.costs = dict(DEFAULT_COSTS, **(costs or {}))
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self.chosen = Counter()
+
+    @staticmethod
+    def work(strategy, features):
+        tokens = features['tokens'] + features['sentences']
+        if strategy == 'exact':
+            return tokens + PAIR_WEIGHT * features['pair_work']
+        if strategy == 'sparsified':
+            return tokens + SPARSE_PAIR_WEIGHT * features['sparse_pair_work']
+        if strategy == 'hierarchical':
+            if features['sentences'] <= rankers.HIERARCHY_BLOCK:
+                return tokens + PAIR_WEIGHT * features['pair_work']
+            # The second pass compares the candidates, about (candidates / sentences)^2 of all pairs
+            share = features['candidates'] / features['sentences']
+            return 2 * tokens + PAIR_WEIGHT * (features['block_pair_work'] + features['pair_work'] * share * share)
+        return tokens
+
+    def predict(self, features):
+        return {strategy: OVERHEAD + self.costs[strategy] * self.work(strategy, features) for strategy, _, _ in STRATEGIES}
+
+    def plan(self, features, budget=LATENCY_BUDGET):
+        """
+        Pick the most accurate strategy predicted to finish within the budget.
+
+        Args:
+            features (dict): Output of document_features
+            budget (float): Seconds available for ranking, or None for no limit
+
+        Returns:
+            Plan: The strategy, its ranker and the predicted seconds. Among equally
+            accurate strategies the faster one wins; when none fits the budget,
+            the fastest strategy overall is used
+        """
+        predicted = self.predict(features)
+        fitting = [(tier, predicted[strategy], strategy, ranker) for strategy, ranker, tier in STRATEGIES
+                   if budget is None or predicted[strategy] <= budget]
+        if fitting:
+            _, _, strategy, ranker = min(fitting)
+        else:
+            _, strategy, ranker = min((predicted[strategy], strategy, ranker) for strategy, ranker, _ in STRATEGIES)
+        with self._lock:
+            self.chosen[strategy] += 1
+        return Plan(strategy, ranker, predicted[strategy], self.work(strategy, features))
+
+    def observe(self, plan, actual_seconds):
+        """Fold the measured running time of a plan into its strategy's per-operation cost."""
+        if plan.work <= 0:
+            return
+        with self._lock:
+            cost = self.costs[plan.strategy]
+            measured = max(actual_seconds - OVERHEAD, 0.0) / plan.work
+            self.costs[plan.strategy] = (1 - self.smoothing) * cost + self.smoothing * measured
+
+    def snapshot(self):
+        with self._lock:
+            return {'costs': dict(self.costs), 'chosen': dict(self.chosen)}
+
+
+default_planner = Planner()
@@ -0,0 +1,126 @@
+"""
+Progress streams for the TextSummarizer application.
+A summary started from the page runs in a background thread that records what
+it is doing as events of a job. The browser follows the job as server-sent
+events and, if the connection drops, reconnects with Last-Event-ID and picks up
+where it left off instead of submitting the text again.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+JOB_TTL = 600.0  # seconds a finished job's events stay available
+MAX_JOBS = 1000  # jobs kept at most; the oldest finished ones are dropped first
+HEARTBEAT = 15.0  # seconds between keep-alive comments on an idle stream
+
+
+def format_event(event_id, event, data):
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class Job:
+    """
+    Events of one background summary, in the order they happened.
+
+    Args:
+        owner: User the job belongs to; only they may follow it
+    """
+
+    def __init__(self, owner):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.events = []
+        self.finished_at = None
+        self._condition = threading.Condition()
+
+    def emit(self, event, **data):
+        with self._condition:
+            self.events.append((event, data))
+            self._condition.notify_all()
+
+    def finish(self, event, **data):
+        """Record the last event ('done' or 'error') and close the stream."""
+        with self._condition:
+            self.events.append((event, data))
+            self.finished_at = time.monotonic()
+            self._condition.notify_all()
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def stream(self, after=0, heartbeat=HEARTBEAT):
+        """
+        Yield the job's events as server-sent events, waiting for new ones until it finishes.
+
+        Args:
+            after (int): Id of the last event the client already has (Last-Event-ID)
+            heartbeat (float): Seconds of silence after which a keep-alive comment is sent
+        """
+        position = after
+        while True:
+            with self._condition:
+                if position >= len(self.events) and not self.finished:
+                    self._condition.wait(heartbeat)
+                pending = self.events[position:]
+                finished = self.finished
+            for event_id, (event, data) in enumerate(pending, position + 1):
+                yield format_event(event_id, event, data)
+            position += len(pending)
+            if finished and position >= len(self.events):
+                return
+            if not pending:
+                yield ': keep-alive\n\n'
+
+
+class JobRegistry:
+    """
+    Jobs of this process by id. Nothing is shared between processes, so a server
+    with several workers must send a job's event stream requests to the worker
+    that started it (sticky routing), or run a single worker.
+
+    Args:
+        ttl (float): Seconds a finished job is kept
+        max_jobs (int): Jobs kept at most
+    """
+
+    def __init__(self, ttl=JOB_TTL, max_jobs=MAX_JOBS):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.started = 0
+
+    def create(self, owner):
+        job = Job(owner)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            self.started += 1
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+        finished = (job_id for job_id, job in list(self._jobs.items()) if job.finished)
+        while len(self._jobs) >= self.max_jobs:
+            job_id = next(finished, None)
+            if job_id is None:
+                break
+            del self._jobs[job_id]
+
+    def snapshot(self):
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if not job.finished)
+            return {'started': self.started, 'running': running, 'kept': len(self._jobs)}
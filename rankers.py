@@ -0,0 +1,577 @@
+"""
+Sentence rankers for the TextSummarizer application.
+Every ranker takes the sentences of a document as a vocabulary.InternedDocument
+and returns one score per sentence; generate_summary keeps the highest scoring ones. Similarities are
+built with sparse matrix products instead of comparing sentence pairs in Python.
+Graph rankers pass their keyword options (top_k, time_limit, stats, callback) to pagerank;
+the linear rankers accept and ignore them.
+
+    textrank               bag-of-words cosine graph ranked with PageRank (the original algorithm)
+    sparse_textrank        TextRank with the pairs from very common terms kept in factored form
+    hierarchical_textrank  TextRank within blocks, then over the best sentences of each block
+    lexrank                TF-IDF cosine graph keeping only edges above a similarity threshold
+    bm25_textrank          TextRank over BM25 similarities
+    embedding_textrank     TextRank over hashed character n-gram embeddings, for scripts word tokenization handles poorly
+    centroid               TF-IDF similarity to the document centroid, linear time
+    frequency              average content-word frequency, linear time
+"""
+
+import hashlib
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator
+
+DEFAULT_RANKER = 'textrank'
+
+DAMPING = 0.85
+PAGERANK_TOL = 1e-6
+PAGERANK_MAX_ITER = 100
+STABLE_ITERATIONS = 3  # iterations the top-k set must stay unchanged before PageRank stops early
+LEXRANK_THRESHOLD = 0.1
+SPARSE_MAX_DF = 0.05  # fraction of sentences above which sparse_textrank keeps a term in factored form...
+SPARSE_MIN_DF = 10  # ...unless it occurs in at most this many sentences
+HIERARCHY_BLOCK = 200  # sentences ranked together in the first pass of hierarchical_textrank
+HIERARCHY_KEEP = 0.2  # fraction of each block passed on to the second pass
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_EPSILON = 0.25  # floor for negative IDFs, as a fraction of the average IDF
+EMBEDDING_DIMENSIONS = 256
+EMBEDDING_NGRAMS = (2, 3, 4)  # lengths of the character n-grams hashed from each term
+EMBEDDING_HASHES = 3  # dimensions each n-gram is added to, with a random sign
+
+# Bytes one similarity graph may use: half for the float32 row tiles being computed,
+# half for the entries kept. Graphs that would not fit keep each row's strongest edges
+SIMILARITY_MEMORY_LIMIT = 256 * 1024 * 1024
+# Sparse product of a tile, plus its dense copy and int64 argpartition indices for top-k selection
+TILE_BYTES_PER_ENTRY = 32
+KEPT_BYTES_PER_ENTRY = 16  # float32 value and int32 column index, copied once when tiles are stacked
+SIMILARITY_WORKERS = 1  # processes building one similarity graph; 1 builds it in the calling process
+SIMILARITY_BLOCK_ROWS = None  # rows per parallel task, or None to size tasks from the memory ceiling
+PARALLEL_MIN_SENTENCES = 2000  # smaller graphs are built in the calling process
+
+RANKERS = {}
+
+
+def register(name):
+    def decorator(func):
+        RANKERS[name] = func
+        return func
+    return decorator
+
+
+def get_ranker(name):
+    try:
+        return RANKERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown ranker '{name}'. Available: {', '.join(sorted(RANKERS))}")
+
+
+def term_matrix(document, content_only=False):
+    """
+    Count terms per sentence.
+
+    Args:
+        document (InternedDocument): Token ids of each sentence
+        content_only (bool): Also ignore punctuation and other non-alphanumeric tokens
+
+    Returns:
+        scipy.sparse.csr_matrix: Sentences x vocabulary matrix of term counts, with a
+        column for each term that is not ignored, in order of first occurrence
+    """
+    flags = document.content if content_only else ~document.stop
+    keep = flags[document.ids]
+    ids = document.ids[keep]
+    # Renumber the kept terms so ignored and unused vocabulary entries get no column
+    used = np.bincount(ids, minlength=len(document.terms)) > 0
+    columns = (np.cumsum(used) - 1)[ids]
+    counts = sparse.csr_matrix(
+        (np.ones(len(ids)), (document.rows()[keep], columns)), shape=(len(document), max(1, int(used.sum()))))
+    counts.sum_duplicates()
+    return counts
+
+
+def tfidf_matrix(counts):
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log(counts.shape[0] / np.maximum(document_frequency, 1))
+    return counts @ sparse.diags(idf)
+
+
+def normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def edge_limit(n, m=None, memory_limit=None):
+    """Edges per row an unfiltered n x m similarity graph keeps under the memory ceiling, or None for all."""
+    memory_limit = memory_limit or SIMILARITY_MEMORY_LIMIT
+    m = n if m is None else m
+    affordable = max(1, (memory_limit // 2) // (KEPT_BYTES_PER_ENTRY * max(n, 1)))
+    return affordable if affordable < m - 1 else None
+
+
+def blockwise_similarity(left, right=None, top_k=None, threshold=None, zero_diagonal=True, memory_limit=None,
+                         workers=None):
+    """
+    Compute the similarity graph left @ right.T in float32 row tiles, so the dense
+    n x n matrix is never held in memory.
+
+    Args:
+        left: Sparse sentences x features matrix
+        right: Sparse sentences x features matrix, or None to use left
+        top_k (int): Keep only the k largest entries of each row
+        threshold (float): Keep only entries of at least this value
+        zero_diagonal (bool): Drop each sentence's similarity to itself
+        memory_limit (int): Bytes for tiles and kept entries, default SIMILARITY_MEMORY_LIMIT
+        workers (int): Processes to spread the row tiles over, default SIMILARITY_WORKERS
+
+    Returns:
+        scipy.sparse.csr_matrix: float32 similarity graph
+    """
+    memory_limit = memory_limit or SIMILARITY_MEMORY_LIMIT
+    workers = workers or SIMILARITY_WORKERS
+    left = sparse.csr_matrix(left, dtype=np.float32)
+    right_t = (left if right is None else sparse.csr_matrix(right, dtype=np.float32)).T.tocsr()
+    n, m = left.shape[0], right_t.shape[1]
+
+    # Without a filter the graph may hold every pair; fall back to the strongest
+    # edges per row that fit in the ceiling
+    affordable = max(1, (memory_limit // 2) // (KEPT_BYTES_PER_ENTRY * max(n, 1)))
+    if top_k is None and threshold is None:
+        top_k = edge_limit(n, m, memory_limit)
+    block_rows = max(1, (memory_limit // 2) // (TILE_BYTES_PER_ENTRY * max(m, 1)))
+
+    if workers > 1 and n >= PARALLEL_MIN_SENTENCES:
+        # Every worker holds a tile at the same time
+        block_rows = SIMILARITY_BLOCK_ROWS or max(1, block_rows // workers)
+        width = min(m, top_k if top_k is not None else affordable)
+        return _parallel_similarity(left, right_t, width, threshold, zero_diagonal, block_rows, workers)
+
+    tiles = []
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        tile = (left[start:stop] @ right_t).tocsr()
+        if top_k is not None and top_k < m:
+            tile = _keep_strongest(tile.toarray(), start, top_k, threshold, zero_diagonal)
+        else:
+            # Nothing to select per row, so the sparse tile is filtered in place of
+            # being expanded; its entries are already in row order
+            row = np.repeat(np.arange(stop - start), np.diff(tile.indptr))
+            keep = tile.data != 0
+            if zero_diagonal:
+                keep &= row + start != tile.indices
+            if threshold is not None:
+                keep &= tile.data >= threshold
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(row[keep], minlength=stop - start))))
+            tile = sparse.csr_matrix((tile.data[keep], tile.indices[keep], indptr), shape=(stop - start, m))
+        tiles.append(tile)
+
+    if not tiles:
+        return sparse.csr_matrix((n, m), dtype=np.float32)
+    return sparse.vstack(tiles, format='csr')
+
+
+def _keep_strongest(dense, start, top_k, threshold=None, zero_diagonal=True):
+    """Sparsify the dense tile of rows start.. of a similarity graph to each row's top_k entries."""
+    rows, m = dense.shape
+    if zero_diagonal:
+        local = np.arange(rows)
+        inside = start + local < m
+        dense[local[inside], start + local[inside]] = 0
+    if threshold is not None:
+        dense[dense < threshold] = 0
+    kept = np.argpartition(-dense, top_k - 1, axis=1)[:, :top_k]
+    kept_values = np.take_along_axis(dense, kept, axis=1)
+    row, position = np.nonzero(kept_values)
+    return sparse.csr_matrix(
+        (kept_values[row, position], (row, kept[row, position])), shape=(rows, m), dtype=np.float32)
+
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown()
+            # Spawned rather than forked: forking a threaded web server is unsafe
+            _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            _executor_workers = workers
+        return _executor
+
+
+def _share(array):
+    segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return segment, (segment.name, array.shape, array.dtype.str)
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _similarity_block(specs, shapes, start, stop, width, threshold, zero_diagonal):
+    # Runs in a worker: the matrices are views of the parent's shared memory, and
+    # the kept entries are written straight into its output buffers
+    segments, arrays = zip(*(_attach(spec) for spec in specs))
+    try:
+        left_data, left_indices, left_indptr, right_data, right_indices, right_indptr, out_values, out_columns = arrays
+        left = sparse.csr_matrix((left_data, left_indices, left_indptr), shape=shapes[0], copy=False)
+        right_t = sparse.csr_matrix((right_data, right_indices, right_indptr), shape=shapes[1], copy=False)
+        m = shapes[1][1]
+
+        tile = (left[start:stop] @ right_t).toarray()
+        if zero_diagonal:
+            local = np.arange(stop - start)
+            inside = start + local < m
+            tile[local[inside], start + local[inside]] = 0
+        if threshold is not None:
+            tile[tile < threshold] = 0
+        if width < m:
+            kept = np.argpartition(-tile, width - 1, axis=1)[:, :width]
+            out_values[start:stop] = np.take_along_axis(tile, kept, axis=1)
+            out_columns[start:stop] = kept
+        else:
+            out_values[start:stop] = tile
+            out_columns[start:stop] = np.arange(m)
+        del left, right_t, left_data, left_indices, left_indptr, right_data, right_indices, right_indptr
+        del out_values, out_columns, arrays
+    finally:
+        for segment in segments:
+            segment.close()
+
+
+def _collect(values_segment, columns_segment, shape, m):
+    # The views must be gone before the segments can be closed, hence a function of its own
+    values = np.ndarray(shape, dtype=np.float32, buffer=values_segment.buf)
+    columns = np.ndarray(shape, dtype=np.int32, buffer=columns_segment.buf)
+    row, position = np.nonzero(values)
+    return sparse.csr_matrix(
+        (values[row, position], (row, columns[row, position])), shape=(shape[0], m), dtype=np.float32)
+
+
+def _parallel_similarity(left, right_t, width, threshold, zero_diagonal, block_rows, workers):
+    """
+    Build the graph on a process pool. Each row keeps at most `width` entries, so
+    the output is a fixed-size buffer every worker writes its rows into.
+    """
+    n, m = left.shape[0], right_t.shape[1]
+    inputs = [left.data, left.indices, left.indptr, right_t.data, right_t.indices, right_t.indptr]
+    outputs = [np.zeros((n, width), dtype=np.float32), np.zeros((n, width), dtype=np.int32)]
+    shared = [_share(array) for array in inputs + outputs]
+    segments = [segment for segment, _ in shared]
+    specs = [spec for _, spec in shared]
+    try:
+        executor = _get_executor(workers)
+        futures = [
+            executor.submit(_similarity_block, specs, (left.shape, right_t.shape), start, min(start + block_rows, n),
+                            width, threshold, zero_diagonal)
+            for start in range(0, n, block_rows)
+        ]
+        for future in futures:
+            future.result()
+        return _collect(segments[-2], segments[-1], (n, width), m)
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def cosine_similarity_matrix(vectors, top_k=None, threshold=None):
+    return blockwise_similarity(normalize_rows(vectors), top_k=top_k, threshold=threshold)
+
+
+def term_embeddings(terms):
+    """
+    Embed terms by their character n-grams, without a trained model.
+
+    Each n-gram of a term (padded with '<' and '>') is hashed to EMBEDDING_HASHES
+    dimensions and signs. This is the hashing trick followed by a fixed sparse random
+    projection, so dot products approximate the number of n-grams two terms share.
+
+    Args:
+        terms (list): Term strings
+
+    Returns:
+        scipy.sparse.csr_matrix: Terms x EMBEDDING_DIMENSIONS matrix
+    """
+    grams = []
+    counts = np.zeros(len(terms), dtype=np.int64)
+    for i, term in enumerate(terms):
+        padded = f"<{term}>"
+        for size in EMBEDDING_NGRAMS:
+            grams.extend(padded[start:start + size] for start in range(len(padded) - size + 1))
+        counts[i] = len(grams)
+    counts[1:] -= counts[:-1].copy()
+    # Terms share most of their n-grams, so each distinct one is hashed once
+    digests = {gram: hashlib.blake2b(gram.encode(), digest_size=8).digest() for gram in set(grams)}
+    hashes = np.frombuffer(b''.join([digests[gram] for gram in grams]), dtype=np.uint64)
+    rows = np.repeat(np.arange(len(terms)), counts)
+    # Bits 16i..16i+15 of the hash pick the i-th dimension, bit 48+i its sign
+    columns = np.concatenate([(hashes >> np.uint64(16 * i)) % np.uint64(EMBEDDING_DIMENSIONS)
+                              for i in range(EMBEDDING_HASHES)]).astype(np.int32)
+    signs = np.concatenate([((hashes >> np.uint64(48 + i)) & np.uint64(1)).astype(np.float32) * 2 - 1
+                            for i in range(EMBEDDING_HASHES)])
+    embeddings = sparse.csr_matrix((signs / math.sqrt(EMBEDDING_HASHES), (np.tile(rows, EMBEDDING_HASHES), columns)),
+                                   shape=(len(terms), EMBEDDING_DIMENSIONS), dtype=np.float32)
+    embeddings.sum_duplicates()
+    return embeddings
+
+
+def sentence_embeddings(document):
+    """Unit-length float32 embedding of each sentence: the sum of its non-stop-word term embeddings."""
+    keep = ~document.stop[document.ids]
+    counts = sparse.csr_matrix((np.ones(int(keep.sum()), dtype=np.float32), (document.rows()[keep], document.ids[keep])),
+                               shape=(len(document), len(document.terms)))
+    vectors = (counts @ term_embeddings(document.terms)).toarray()
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def dense_similarity(vectors, memory_limit=None):
+    """
+    Cosine similarities of unit-length dense vectors, with negative similarities
+    and each vector's similarity to itself set to 0.
+
+    Args:
+        vectors (numpy.ndarray): float32 sentences x dimensions matrix
+        memory_limit (int): Bytes for the graph, default SIMILARITY_MEMORY_LIMIT
+
+    Returns:
+        numpy.ndarray or scipy.sparse.csr_matrix: The dense float32 graph from one
+        matrix product when it fits in half the ceiling, else the strongest edges of
+        each row, computed in row tiles
+    """
+    memory_limit = memory_limit or SIMILARITY_MEMORY_LIMIT
+    n = vectors.shape[0]
+    if 4 * n * n <= memory_limit // 2:
+        similarity = vectors @ vectors.T
+        np.maximum(similarity, 0, out=similarity)
+        np.fill_diagonal(similarity, 0)
+        return similarity
+
+    top_k = max(1, (memory_limit // 2) // (KEPT_BYTES_PER_ENTRY * n))
+    block_rows = max(1, (memory_limit // 2) // (TILE_BYTES_PER_ENTRY * n))
+    tiles = []
+    for start in range(0, n, block_rows):
+        tile = vectors[start:start + block_rows] @ vectors.T
+        np.maximum(tile, 0, out=tile)
+        tiles.append(_keep_strongest(tile, start, top_k))
+    return sparse.vstack(tiles, format='csr')
+
+
+def pagerank(matrix, personalization=None, damping=DAMPING, tol=PAGERANK_TOL, max_iter=PAGERANK_MAX_ITER,
+             top_k=None, time_limit=None, stats=None, start=None, callback=None):
+    """
+    Weighted PageRank by power iteration, with the same conventions as
+    networkx.pagerank: edge weights are normalized per row and dangling rows
+    redistribute their rank according to the personalization vector.
+
+    It is an anytime algorithm: besides converging, it stops once the top_k
+    highest ranked nodes have stayed the same for STABLE_ITERATIONS iterations,
+    or once it has run for time_limit seconds, and returns the ranks computed so far.
+
+    Args:
+        matrix: Square (sparse or dense) matrix of non-negative edge weights, or a
+            LinearOperator that computes products with it
+        personalization (sequence): Teleport weight of each node, or None for uniform
+        damping (float): Probability of following an edge rather than teleporting
+        tol (float): Convergence tolerance per node
+        max_iter (int): Iteration cap; the last iterate is returned if it is reached
+        top_k (int): Number of nodes that will be selected, or None to iterate until convergence
+        time_limit (float): Seconds of iterating after which to stop, counted from the
+            first iteration so building the graph does not use them up; None (the
+            default) iterates until convergence
+        stats (dict): If given, receives 'iterations', 'stop_reason' and 'converged'
+        start (sequence): Initial ranks, e.g. those of a previous version of the graph,
+            or None to start from uniform ranks
+        callback (callable): Called with the iteration number after every iteration
+
+    Returns:
+        numpy.ndarray: Rank of each node, summing to 1
+    """
+    if not isinstance(matrix, LinearOperator):
+        matrix = sparse.csr_matrix(matrix)
+    n = matrix.shape[0]
+    out_weight = np.asarray(matrix @ np.ones(n)).ravel()
+    # Rows of a factored matrix can sum to rounding noise instead of exactly zero
+    dangling = out_weight <= 1e-12
+    out_weight[dangling] = 1.0
+    transposed = matrix.T
+    track_top = top_k is not None and 0 < top_k < n
+
+    p = np.full(n, 1.0 / n) if personalization is None else np.asarray(personalization, dtype=float)
+    p = p / p.sum()
+    x = np.full(n, 1.0 / n) if start is None else np.asarray(start, dtype=float) / np.sum(start)
+    top, stable = None, 0
+    stop_reason = 'max_iter'
+    iterations = 0
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+    while iterations < max_iter:
+        iterations += 1
+        last = x
+        spread = last / out_weight
+        spread[dangling] = 0.0
+        x = damping * (np.asarray(transposed @ spread).ravel() + last[dangling].sum() * p) + (1 - damping) * p
+        if callback is not None:
+            callback(iterations)
+        if np.abs(x - last).sum() < n * tol:
+            stop_reason = 'tolerance'
+            break
+        if track_top:
+            current = frozenset(np.argpartition(-x, top_k - 1)[:top_k].tolist())
+            stable = stable + 1 if current == top else 0
+            top = current
+            if stable >= STABLE_ITERATIONS:
+                stop_reason = 'stable_top_k'
+                break
+        if deadline is not None and time.monotonic() >= deadline:
+            stop_reason = 'time_limit'
+            break
+
+    if stats is not None:
+        stats['iterations'] = iterations
+        stats['stop_reason'] = stop_reason
+        stats['converged'] = stop_reason in ('tolerance', 'stable_top_k')
+    return x
+
+
+@register('textrank')
+def textrank(document, weights, **pagerank_options):
+    # Bag-of-words cosine over every token that is not a stop word, as the
+    # original per-pair implementation did
+    similarity = cosine_similarity_matrix(term_matrix(document))
+    return pagerank(similarity, personalization=weights, **pagerank_options)
+
+
+def max_document_frequency(sentences):
+    return max(SPARSE_MIN_DF, int(SPARSE_MAX_DF * sentences))
+
+
+@register('sparse_textrank')
+def sparse_textrank(document, weights, **pagerank_options):
+    normalized = normalize_rows(term_matrix(document)).tocsc()
+    document_frequency = np.diff(normalized.indptr)
+    common = document_frequency > max_document_frequency(normalized.shape[0])
+    # Terms found in many sentences link almost every pair and account for most of
+    # the pairwise work. Only pairs sharing a rarer term are materialized; the common
+    # terms contribute through their (few) columns at every PageRank step, which
+    # gives the same scores as textrank without the dense n x n product
+    rare_terms = normalized[:, ~common].tocsr()
+    common_terms = normalized[:, common].tocsr()
+    explicit = (rare_terms @ rare_terms.T).tocsr()
+    self_similarity = np.asarray(normalized.multiply(normalized).sum(axis=1)).ravel()
+
+    def product(x):
+        x = np.asarray(x).ravel()
+        return explicit @ x + common_terms @ (common_terms.T @ x) - self_similarity * x
+
+    n = normalized.shape[0]
+    similarity = LinearOperator((n, n), matvec=product, rmatvec=product, dtype=float)
+    return pagerank(similarity, personalization=weights, **pagerank_options)
+
+
+def hierarchy_candidates(block_length):
+    return max(1, math.ceil(block_length * HIERARCHY_KEEP))
+
+
+@register('hierarchical_textrank')
+def hierarchical_textrank(document, weights, top_k=None, time_limit=None, stats=None, callback=None):
+    n = len(document)
+    if n <= HIERARCHY_BLOCK:
+        return textrank(document, weights, top_k=top_k, time_limit=time_limit, stats=stats, callback=callback)
+
+    scores = np.zeros(n)
+    candidates = []
+    for start in range(0, n, HIERARCHY_BLOCK):
+        block = slice(start, min(start + HIERARCHY_BLOCK, n))
+        keep = hierarchy_candidates(block.stop - block.start)
+        block_scores = textrank(document.select(range(block.start, block.stop)), weights[block], top_k=keep,
+                                time_limit=time_limit)
+        scores[block] = block_scores
+        best = np.argsort(-block_scores, kind='stable')[:keep]
+        candidates.extend(start + best)
+
+    candidates = sorted(candidates)
+    final = textrank(document.select(candidates), [weights[i] for i in candidates], top_k=top_k, time_limit=time_limit,
+                     stats=stats, callback=callback)
+    # Second-pass scores sum to 1 and first-pass scores are below 1, so shifting
+    # the candidates up by 1 ranks every candidate above every other sentence
+    scores[candidates] = 1.0 + final
+    return scores
+
+
+@register('lexrank')
+def lexrank(document, weights, threshold=LEXRANK_THRESHOLD, **pagerank_options):
+    # Unweighted edges between sentences that are similar enough; most pairs drop
+    # out tile by tile, before the graph is assembled
+    similarity = cosine_similarity_matrix(
+        tfidf_matrix(term_matrix(document, content_only=True)), threshold=threshold)
+    adjacency = (similarity > 0).astype(float)
+    return pagerank(adjacency, personalization=weights, **pagerank_options)
+
+
+@register('bm25_textrank')
+def bm25_textrank(document, weights, k1=BM25_K1, b=BM25_B, **pagerank_options):
+    counts = term_matrix(document, content_only=True)
+    n = counts.shape[0]
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((n - document_frequency + 0.5) / (document_frequency + 0.5))
+    idf[idf < 0] = BM25_EPSILON * max(idf.mean(), 0.0)
+
+    # BM25 term weights of every sentence as a document...
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    average_length = lengths.mean() or 1.0
+    weighted = counts.tocoo()
+    norm = k1 * (1 - b + b * lengths[weighted.row] / average_length)
+    bm25 = sparse.csr_matrix(
+        (idf[weighted.col] * weighted.data * (k1 + 1) / (weighted.data + norm), (weighted.row, weighted.col)),
+        shape=counts.shape)
+    # ...scored against every other sentence as a query
+    similarity = blockwise_similarity(bm25, (counts > 0).astype(float))
+    return pagerank(similarity, personalization=weights, **pagerank_options)
+
+
+@register('embedding_textrank')
+def embedding_textrank(document, weights, **pagerank_options):
+    similarity = dense_similarity(sentence_embeddings(document))
+    if isinstance(similarity, np.ndarray):
+        # A float32 matrix times a float64 vector would copy the matrix at every step
+        dense = similarity
+        similarity = LinearOperator(dense.shape, matvec=lambda x: dense @ np.asarray(x, dtype=np.float32).ravel(),
+                                    rmatvec=lambda x: dense @ np.asarray(x, dtype=np.float32).ravel(),
+                                    dtype=np.float32)
+    return pagerank(similarity, personalization=weights, **pagerank_options)
+
+
+@register('centroid')
+def centroid(document, weights, **pagerank_options):
+    vectors = normalize_rows(tfidf_matrix(term_matrix(document, content_only=True)))
+    center = np.asarray(vectors.T @ np.asarray(weights, dtype=float)).ravel()
+    length = math.sqrt(center @ center) or 1.0
+    return vectors @ (center / length)
+
+
+@register('frequency')
+def frequency(document, weights, **pagerank_options):
+    counts = term_matrix(document, content_only=True)
+    frequencies = np.asarray(counts.sum(axis=0)).ravel()
+    frequencies /= frequencies.max() or 1.0
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    lengths[lengths == 0] = 1.0
+    # Average document frequency of a sentence's content words, weighted by how often it was repeated
+    return np.asarray(weights, dtype=float) * (counts @ frequencies) / lengths
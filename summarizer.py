@@ -0,0 +1,241 @@
+"""
+Summarization core for the TextSummarizer application.
+Text extraction, sentence ranking and the summary metrics, kept free of Flask so
+the web app and the bulk command line tool (bulk_summarize.py) run the same
+summarizer. Nothing here touches the database or the request.
+"""
+
+import re
+import time
+
+import docx
+import nltk
+import PyPDF2
+from nltk.corpus import stopwords
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+import dedup
+import incremental
+import planner
+import rankers
+import vocabulary
+
+SUPPORTED_EXTENSIONS = {'txt', 'pdf', 'docx'}
+
+# Each key's last TextRank graph, so resubmitting edited text only ranks what changed;
+# the web app sizes it from its config
+analysis_cache = incremental.AnalysisCache()
+
+
+def download_nltk_resources():
+    resources = ['punkt', 'stopwords']
+    
+    # Add punkt_tab to the list since it's being requested by the code
+    if 'punkt_tab' not in resources:
+        resources.append('punkt_tab')
+        
+    for resource in resources:
+        try:
+            nltk.data.find(f'tokenizers/{resource}')
+        except LookupError:
+            print(f"Downloading NLTK resource: '{resource}'")
+            nltk.download(resource)
+            print(f"Resource '{resource}' has been downloaded successfully.")
+
+
+def extract_text_from_path(file_path, progress=None):
+    """
+    Extract the text of a TXT, PDF or DOCX file.
+
+    Args:
+        file_path (str): Path of the file; its extension selects the format
+        progress (callable): Called as progress('extract', page=..., pages=...) after each PDF page
+
+    Returns:
+        str: The text, or '' for unsupported extensions
+    """
+    file_type = file_path.rsplit('.', 1)[-1].lower()
+    text = ""
+    if file_type == 'txt':
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    elif file_type == 'pdf':
+        with open(file_path, 'rb') as f:
+            pdf_reader = PyPDF2.PdfReader(f)
+            for page_num in range(len(pdf_reader.pages)):
+                text += pdf_reader.pages[page_num].extract_text()
+                if progress is not None:
+                    progress('extract', page=page_num + 1, pages=len(pdf_reader.pages))
+    elif file_type == 'docx':
+        doc = docx.Document(file_path)
+        for para in doc.paragraphs:
+            text += para.text + '\n'
+    return text
+
+
+def summary_length(text, compression_ratio):
+    """Number of sentences to keep so that compression_ratio of the text's sentences is removed."""
+    sentences = sent_tokenize(text)
+    return max(1, int(len(sentences) * (1 - compression_ratio)))
+
+
+# Sentences at the start of a long document that the early preview summary is taken from
+PREVIEW_SENTENCES = 200
+
+
+def generate_summary(text, num_sentences=5, stats=None, ranker=rankers.DEFAULT_RANKER, budget=planner.LATENCY_BUDGET,
+                     previous=None, progress=None, time_limit=None):
+    stop_words = set(stopwords.words('english'))
+    
+    # Use custom sentence tokenization for non-Latin scripts
+    def tokenize_sentences(text):
+        # Check if text contains CJK characters (Chinese, Japanese)
+        if any('\u4e00' <= char <= '\u9fff' for char in text) or \
+           any('\u3040' <= char <= '\u309f' for char in text) or \
+           any('\u30a0' <= char <= '\u30ff' for char in text):
+            # Split on common CJK sentence endings
+            sentences = []
+            current = ""
+            for char in text:
+                current += char
+                if char in ['。', '！', '？', '．', '!', '?', '.']:
+                    if current.strip():
+                        sentences.append(current.strip())
+                    current = ""
+            if current.strip():
+                sentences.append(current.strip())
+            return sentences
+        # Check if text contains Hindi characters
+        elif any('\u0900' <= char <= '\u097f' for char in text):
+            # Split on common Hindi sentence endings
+            sentences = []
+            current = ""
+            for char in text:
+                current += char
+                if char in ['।', '!', '?', '.']:
+                    if current.strip():
+                        sentences.append(current.strip())
+                    current = ""
+            if current.strip():
+                sentences.append(current.strip())
+            return sentences
+        else:
+            # Use NLTK for other languages
+            return sent_tokenize(text)
+    
+    # Step 1 - Split text into sentences using custom tokenization
+    sentences = tokenize_sentences(text)
+    
+    # Check if there are enough sentences to summarize
+    if len(sentences) <= num_sentences:
+        return ' '.join(sentences)
+    
+    # Step 2 - Collapse repeated and near-duplicate sentences into one weighted node
+    representatives, weights = dedup.collapse_duplicates(sentences)
+    if stats is not None:
+        stats['duplicates_removed'] = len(sentences) - len(representatives)
+    unique_sentences = [sentences[i] for i in representatives]
+
+    if len(unique_sentences) <= num_sentences:
+        return ' '.join(unique_sentences)
+
+    if progress is not None:
+        progress('sentences', count=len(sentences), unique=len(unique_sentences))
+        if len(unique_sentences) > PREVIEW_SENTENCES:
+            # A quick summary of the first part with the linear-time scorer, shown until
+            # the ranked summary of the whole text is ready
+            chunk = unique_sentences[:PREVIEW_SENTENCES]
+            chunk_document = vocabulary.InternedDocument.from_sentences(
+                chunk, lambda sentence: word_tokenize(sentence.lower()), stop_words)
+            chunk_scores = rankers.frequency(chunk_document, weights[:PREVIEW_SENTENCES])
+            preview_length = max(1, num_sentences * PREVIEW_SENTENCES // len(unique_sentences))
+            preview = sorted(range(len(chunk)), key=lambda i: (chunk_scores[i], chunk[i]), reverse=True)[:preview_length]
+            progress('preview', summary=' '.join(chunk[i] for i in sorted(preview)))
+
+    # Step 3 - Tokenize the sentences into token ids of a per-document vocabulary
+    document = vocabulary.InternedDocument.from_sentences(
+        unique_sentences, lambda sentence: word_tokenize(sentence.lower()), stop_words)
+
+    # Step 4 - Score the sentences, biased towards sentences that were repeated; 'auto'
+    # picks the most accurate ranker predicted to finish within the latency budget. The
+    # budget only guides that choice: the prediction leaves out building the graph, so
+    # it is no basis for stopping the ranking
+    plan = None
+    if ranker == 'auto':
+        plan = planner.default_planner.plan(planner.document_features(document), budget)
+        ranker = plan.ranker
+    # PageRank stops once the selected sentences stop changing; only callers that pass
+    # a time_limit also cut it short with the best ranking found so far
+    started = time.perf_counter()
+    ranking_stats = {}
+    callback = None
+    if progress is not None:
+        progress('ranking', ranker=ranker, iteration=0)
+        callback = lambda iteration: progress('ranking', ranker=ranker, iteration=iteration)
+    if ranker == 'textrank' and previous is not None:
+        # Diff against the previous version submitted under the same key and rank only the changes
+        scores = analysis_cache.textrank(previous, unique_sentences, document, weights, top_k=num_sentences,
+                                         time_limit=time_limit, stats=ranking_stats, callback=callback)
+    else:
+        scores = rankers.get_ranker(ranker)(document, weights, top_k=num_sentences,
+                                            time_limit=time_limit, stats=ranking_stats, callback=callback)
+    ranking_seconds = time.perf_counter() - started
+    # An incremental run says nothing about what ranking from scratch costs
+    if plan is not None and not ranking_stats.get('reused_sentences'):
+        planner.default_planner.observe(plan, ranking_seconds)
+    if stats is not None:
+        stats['ranker'] = ranker
+        stats['ranking_seconds'] = ranking_seconds
+        # Rankers without an iterative stage always finish
+        stats['converged'] = ranking_stats.get('converged', True)
+        stats['iterations'] = ranking_stats.get('iterations', 0)
+        stats['reused_sentences'] = ranking_stats.get('reused_sentences', 0)
+        if plan is not None:
+            stats['strategy'] = plan.strategy
+            stats['predicted_seconds'] = plan.predicted_seconds
+
+    # Step 5 - Sort the sentences by score and select top n
+    ranked = sorted(range(len(unique_sentences)), key=lambda i: (scores[i], unique_sentences[i]), reverse=True)
+    selected = ranked[:num_sentences]
+
+    # Step 6 - Map the selection back to original positions and restore document order
+    selected.sort(key=lambda i: representatives[i])
+    summarize_text = [unique_sentences[i] for i in selected]
+
+    # Step 7 - Return the summarized text
+    return ' '.join(summarize_text)
+
+
+def calculate_rouge_score(reference, summary):
+    # Simple ROUGE-1 calculation (word overlap)
+    reference_words = set(word_tokenize(reference.lower()))
+    summary_words = set(word_tokenize(summary.lower()))
+    
+    overlap = reference_words.intersection(summary_words)
+    
+    if len(reference_words) == 0:
+        return 0
+    
+    return len(overlap) / len(reference_words)
+
+
+def calculate_compression_ratio(original_text, summary_text):
+    if not original_text or not summary_text:
+        return 0.0  # Return minimum compression ratio instead of 0
+    
+    # Clean and normalize text before calculating ratio
+    original_text = re.sub(r'\s+', ' ', original_text.strip())
+    summary_text = re.sub(r'\s+', ' ', summary_text.strip())
+    
+    # Calculate lengths using word count for more meaningful ratio
+    original_words = len(word_tokenize(original_text))
+    summary_words = len(word_tokenize(summary_text))
+    
+    if original_words == 0 or summary_words > original_words:  # Avoid division by zero and invalid ratios
+        return 0.0  # Return minimum compression ratio
+    
+    # Calculate compression (how much text was removed)
+    compression = (original_words - summary_words) / original_words
+    # Ensure ratio is between 0 and 1
+    compression = max(0.0, min(1.0, compression))
+    return compression
@@ -0,0 +1,37 @@
+import pytest
+
+import chatbot_responses
+from benchmarks import CHATBOT_CORPUS
+
+RESPONSES = {intent['name']: intent['response'] for intent in chatbot_responses.INTENTS}
+
+
+def baseline_reply(expected):
+    # The reply the original if/elif chain gave for the intent it picked
+    return RESPONSES[expected] if expected is not None else chatbot_responses.DEFAULT_RESPONSE
+
+
+@pytest.mark.parametrize('message, expected', CHATBOT_CORPUS)
+def test_intent_matches_original_chain(message, expected):
+    intent = chatbot_responses.get_intent(message)
+    assert (intent['name'] if intent else None) == expected
+
+
+@pytest.mark.parametrize('message, expected', CHATBOT_CORPUS)
+def test_reply_matches_original_chain(message, expected):
+    assert chatbot_responses.get_response(message) == baseline_reply(expected)
+
+
+def test_every_intent_name_is_unique():
+    assert len(RESPONSES) == len(chatbot_responses.INTENTS)
+
+
+@pytest.mark.parametrize('message', ['what is the weather today', 'what time is it', 'what day is it today',
+                                     'I like turtles'])
+def test_off_topic_message_gets_default_reply(message):
+    assert chatbot_responses.get_response(message) == chatbot_responses.DEFAULT_RESPONSE
+
+
+def test_paraphrase_is_retrieved():
+    intent, _ = chatbot_responses.retrieve_intent('how many summaries per day can I make')
+    assert intent['name'] == 'limit_exceeded'
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import dedup
+
+
+def fingerprint(sentence):
+    return dedup.simhash(dedup.sentence_features(dedup.normalize_sentence(sentence)))
+
+
+def test_simhash_is_pinned():
+    assert fingerprint('The quick brown fox jumps over the lazy dog.') == 0x1ad0837090563a37
+
+
+def test_simhash_does_not_depend_on_hash_seed():
+    code = "import dedup; print(dedup.simhash(dedup.sentence_features('the quick brown fox jumps')))"
+    here = os.path.dirname(os.path.abspath(__file__))
+    outputs = {
+        subprocess.run([sys.executable, '-c', code], cwd=here, capture_output=True, text=True, check=True,
+                       env=dict(os.environ, PYTHONHASHSEED=seed)).stdout
+        for seed in ('1', '2', '3')
+    }
+    assert len(outputs) == 1
+
+
+def test_near_duplicates_collapse():
+    sentences = [
+        'Subscribe to our channel for more videos about cooking at home.',
+        'The recipe needs two cups of flour and a pinch of salt.',
+        'Subscribe to our channel for more videos about cooking at home!',
+    ]
+    representatives, weights = dedup.collapse_duplicates(sentences)
+    assert representatives == [0, 1]
+    assert weights == [2, 1]
@@ -0,0 +1,28 @@
+import translation
+
+
+def test_long_sentence_is_packed_into_word_runs():
+    sentence = ' '.join(['word'] * 30) + '.'
+    pieces = translation.split_into_sentences(sentence, max_chunk_size=20)
+    assert pieces == ['word word word word'] * 7 + ['word word.']
+
+
+def test_only_overlong_words_are_cut():
+    pieces = translation.split_into_sentences('a ' + 'x' * 25, max_chunk_size=20)
+    assert pieces == ['a', 'x' * 20, 'x' * 5]
+
+
+class UppercaseClient:
+    def translate(self, text, source, target):
+        return text.upper()
+
+
+def test_line_breaks_and_bullets_are_kept():
+    text = 'Intro sentence. Second one!\n\n• First bullet\n• Second bullet.'
+    translation.cache.clear()
+    assert translation.translate_text(text, 'fr', client=UppercaseClient()) == text.upper()
+
+
+def test_cjk_sentences_are_not_spaced_apart():
+    translation.cache.clear()
+    assert translation.translate_text('第一句。第二句！', 'fr', client=UppercaseClient()) == '第一句。第二句！'
@@ -0,0 +1,469 @@
+"""
+Translation helpers for the TextSummarizer application.
+Splits summaries into sentence-aligned chunks, translates the chunks concurrently
+and caches the results, so switching a summary between languages does not hit
+the translation service again for text it has already seen.
+
+Translations are remembered per sentence: first in an in-process LRU cache, then
+in an optional persistent translation memory shared across summaries, so
+recurring sentences (disclaimers, headings, repeated captions) are only ever
+sent to the translation service once.
+
+Calls to the service go through a TranslationClient, which gives every call a
+deadline, optionally hedges a straggling call with a second attempt, and trips
+a circuit breaker while the service keeps failing so requests fail fast.
+"""
+
+import hashlib
+import random
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# The Google endpoint rejects requests over 5000 characters
+MAX_CHUNK_SIZE = 4000
+MAX_WORKERS = 4
+CACHE_SIZE = 2048
+
+# Resilience defaults, overridable per TranslationClient
+CALL_TIMEOUT = 10.0  # seconds before a single call is abandoned
+HEDGE_AFTER = None  # seconds before a second attempt is raced against a slow call
+FAILURE_THRESHOLD = 5  # consecutive failures that open the breaker
+RESET_TIMEOUT = 30.0  # seconds the breaker stays open before a trial call
+
+# Latin punctuation needs trailing whitespace to count as a sentence end (so "3.5"
+# stays whole); CJK and Devanagari sentence marks are usually not followed by a space
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|(?<=[。！？．।])\s*')
+
+
+def google_translator_factory(source, target):
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source=source, target=target)
+
+
+class TranslationUnavailable(Exception):
+    """Raised when the translation service is failing or too slow to answer."""
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while the translation service is down.
+
+    After failure_threshold consecutive failures the breaker opens and rejects
+    calls for reset_timeout seconds; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self.times_opened = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self.state == 'closed':
+                return True
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'times_opened': self.times_opened,
+                'rejected_calls': self.rejected,
+            }
+
+
+class TranslationClient:
+    """
+    Calls a translator backend with a deadline, optional hedging and a circuit breaker.
+
+    Args:
+        factory (callable): Builds a translator for (source, target); anything
+            with a translate(text) method works, e.g. FakeTranslator in tests
+        timeout (float): Seconds to wait for a call before giving up on it
+        hedge_after (float): If set, seconds after which a second identical call
+            is started and whichever finishes first is used
+        breaker (CircuitBreaker): Breaker shared by all calls of this client
+        max_calls (int): Upper bound on calls in flight, including abandoned ones
+    """
+
+    def __init__(self, factory, timeout=CALL_TIMEOUT, hedge_after=HEDGE_AFTER, breaker=None, max_calls=16):
+        self.factory = factory
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self.hedged_calls = 0
+        self.timed_out_calls = 0
+        # Calls that miss their deadline keep running in the background, so they
+        # get their own pool instead of the one that schedules chunks
+        self._executor = ThreadPoolExecutor(max_workers=max_calls, thread_name_prefix='translate')
+
+    def translate(self, text, source, target):
+        if not self.breaker.allow():
+            raise TranslationUnavailable("Translation service is temporarily unavailable")
+
+        deadline = time.monotonic() + self.timeout
+        attempts = [self._executor.submit(self._call, text, source, target)]
+        if self.hedge_after is not None and self.hedge_after < self.timeout:
+            done, _ = wait(attempts, timeout=self.hedge_after)
+            if not done:
+                self.hedged_calls += 1
+                attempts.append(self._executor.submit(self._call, text, source, target))
+
+        error = None
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    self.breaker.record_success()
+                    return future.result()
+                error = future.exception()
+
+        self.breaker.record_failure()
+        if error is None:
+            self.timed_out_calls += 1
+            raise TranslationUnavailable(f"Translation timed out after {self.timeout}s")
+        raise error
+
+    def _call(self, text, source, target):
+        return self.factory(source, target).translate(text)
+
+    def snapshot(self):
+        state = self.breaker.snapshot()
+        state['hedged_calls'] = self.hedged_calls
+        state['timed_out_calls'] = self.timed_out_calls
+        return state
+
+
+class FakeTranslator:
+    """
+    Local stand-in for GoogleTranslator with injectable latency and failures.
+
+    Use FakeTranslator.factory(...) as a TranslationClient factory. Translations
+    are the input with every line prefixed by the target language, so line
+    structure is preserved like the real service does.
+    """
+
+    def __init__(self, source='auto', target='en', latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        self.source = source
+        self.target = target
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+    @classmethod
+    def factory(cls, **options):
+        return lambda source, target: cls(source, target, **options)
+
+    def translate(self, text):
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if self.random.random() < self.failure_rate:
+            raise RuntimeError("Injected translation failure")
+        return '\n'.join(f"[{self.target}] {line}" for line in text.split('\n'))
+
+
+# The client used when translate_text is not given one; replace it to change
+# timeouts or swap in a local stand-in
+default_client = TranslationClient(google_translator_factory)
+
+
+class TranslationCache:
+    """Thread-safe LRU cache of translated sentences keyed by (sentence hash, source, target)."""
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = TranslationCache()
+
+# Process-wide counters, reported by the /metrics route
+_metrics = {'sentences': 0, 'cache_hits': 0, 'memory_hits': 0, 'misses': 0, 'remote_calls': 0}
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    hits = metrics['cache_hits'] + metrics['memory_hits']
+    metrics['hit_rate'] = hits / metrics['sentences'] if metrics['sentences'] else 0.0
+    return metrics
+
+
+def _record(stats):
+    with _metrics_lock:
+        for name in _metrics:
+            _metrics[name] += stats.get(name, 0)
+
+
+def normalize_sentence(sentence):
+    return unicodedata.normalize('NFC', ' '.join(sentence.split()))
+
+
+def sentence_hash(sentence):
+    return hashlib.sha256(normalize_sentence(sentence).encode('utf-8')).hexdigest()
+
+
+def split_into_segments(text, max_chunk_size=MAX_CHUNK_SIZE):
+    """
+    Split text into sentences no longer than max_chunk_size, keeping what separates them.
+
+    Lines are split first, so line breaks, paragraphs and bullet lines survive
+    translation. Sentences that are longer than the limit on their own are split
+    into runs of whole words up to the limit, and only cut mid-word when a single
+    word is over it.
+
+    Returns:
+        tuple: (sentences, separators) where separators has one more entry than
+        sentences: the text before the first sentence, then the text after each.
+        Joining them alternately gives back the text up to whitespace inside sentences
+    """
+    pieces = []
+    separators = ['']
+    for line_number, line in enumerate(text.split('\n')):
+        if line_number:
+            separators[-1] += '\n'
+        position = 0
+        segments = []
+        for boundary in _SENTENCE_BOUNDARY.finditer(line):
+            segments.append((line[position:boundary.start()], boundary.group()))
+            position = boundary.end()
+        segments.append((line[position:], ''))
+        for segment, gap in segments:
+            sentence = segment.strip()
+            if not sentence:
+                separators[-1] += segment + gap
+                continue
+            separators[-1] += segment[:len(segment) - len(segment.lstrip())]
+            if len(sentence) <= max_chunk_size:
+                runs = [sentence]
+            else:
+                # Over-long sentence: fall back to word boundaries, keeping as many
+                # words together as fit so the translator still sees them in context
+                words = []
+                for word in sentence.split():
+                    while len(word) > max_chunk_size:
+                        words.append(word[:max_chunk_size])
+                        word = word[max_chunk_size:]
+                    words.append(word)
+                runs = pack_chunks(words, max_chunk_size)
+            for run_number, run in enumerate(runs):
+                if run_number:
+                    separators.append(' ')
+                pieces.append(run)
+            separators.append(segment[len(segment.rstrip()):] + gap)
+    return pieces, separators
+
+
+def split_into_sentences(text, max_chunk_size=MAX_CHUNK_SIZE):
+    """Split text into sentences no longer than max_chunk_size (see split_into_segments)."""
+    return split_into_segments(text, max_chunk_size)[0]
+
+
+def split_into_chunks(text, max_chunk_size=MAX_CHUNK_SIZE):
+    """
+    Split text into chunks of whole sentences no longer than max_chunk_size.
+
+    Args:
+        text (str): The text to split
+        max_chunk_size (int): Maximum number of characters per chunk
+
+    Returns:
+        list: The chunks in their original order
+    """
+    return pack_chunks(split_into_sentences(text, max_chunk_size), max_chunk_size)
+
+
+def pack_chunks(pieces, max_chunk_size=MAX_CHUNK_SIZE, separator=' '):
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if not current:
+            current = piece
+        elif len(current) + len(separator) + len(piece) <= max_chunk_size:
+            current += separator + piece
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def translate_chunk(chunk, source, target, client):
+    try:
+        return client.translate(chunk, source, target)
+    except TranslationUnavailable:
+        # Timeouts and an open breaker are not fixed by changing the source language
+        raise
+    except Exception as e:
+        if source == 'auto':
+            raise
+        # Retry just this chunk with auto-detection rather than the whole text
+        print(f"Chunk translation error with source {source}: {str(e)}")
+        return client.translate(chunk, 'auto', target)
+
+
+def translate_batch(batch, source, target, client):
+    # Sentences are sent one per line so the translation can be split back per sentence
+    result = translate_chunk('\n'.join(batch), source, target, client)
+    lines = [line.strip() for line in (result or '').split('\n') if line.strip()]
+    if len(lines) == len(batch):
+        return lines, 1
+    # The service merged or split lines; translate these sentences one by one instead
+    return [translate_chunk(sentence, source, target, client) for sentence in batch], 1 + len(batch)
+
+
+def translate_text(text, target, source='auto', client=None, memory=None, stats=None,
+                   max_workers=MAX_WORKERS, max_chunk_size=MAX_CHUNK_SIZE):
+    """
+    Translate text sentence by sentence, sending only unseen sentences to the translator.
+
+    Sentences are looked up in the in-process cache, then in bulk in the
+    translation memory; the remaining ones are packed into chunks that are
+    translated concurrently.
+
+    Args:
+        text (str): The text to translate
+        target (str): Target language code
+        source (str): Source language code, or 'auto'
+        client (TranslationClient): Client used for remote calls; defaults to the
+            module-level default_client
+        memory: Optional persistent store with get_many(hashes, source, target)
+            returning {hash: translation} and put_many(entries, source, target)
+        stats (dict): Optional dict that receives hit/miss counts for this call
+        max_workers (int): Upper bound on concurrent translation calls
+        max_chunk_size (int): Maximum number of characters per request
+
+    Returns:
+        str: The translated text
+    """
+    client = client or default_client
+    sentences, separators = split_into_segments(text, max_chunk_size)
+    hashes = [sentence_hash(sentence) for sentence in sentences]
+    translated = {}
+    counts = {'sentences': len(sentences), 'cache_hits': 0, 'memory_hits': 0, 'misses': 0, 'remote_calls': 0}
+
+    for sentence_key in set(hashes):
+        value = cache.get((sentence_key, source, target))
+        if value is not None:
+            translated[sentence_key] = value
+
+    lookup = {sentence_key for sentence_key in hashes if sentence_key not in translated}
+    if lookup and memory is not None:
+        try:
+            for sentence_key, value in memory.get_many(list(lookup), source, target).items():
+                translated[sentence_key] = value
+                cache.put((sentence_key, source, target), value)
+        except Exception as e:
+            print(f"Translation memory lookup error: {e}")
+
+    # Each distinct missing sentence is translated once, however often it repeats
+    missing = {}
+    for sentence_key, sentence in zip(hashes, sentences):
+        if sentence_key not in translated:
+            missing.setdefault(sentence_key, normalize_sentence(sentence))
+
+    for sentence_key in hashes:
+        if sentence_key in missing:
+            counts['misses'] += 1
+        elif sentence_key in lookup:
+            counts['memory_hits'] += 1
+        else:
+            counts['cache_hits'] += 1
+
+    if missing:
+        miss_keys = list(missing)
+        batches = []
+        for batch_text in pack_chunks([missing[k] for k in miss_keys], max_chunk_size, separator='\n'):
+            batches.append(batch_text.split('\n'))
+        workers = max(1, min(max_workers, len(batches)))
+        new_entries = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in submission order, so sentence order is kept
+            results = executor.map(lambda batch: translate_batch(batch, source, target, client), batches)
+            position = 0
+            for batch, (lines, calls) in zip(batches, results):
+                counts['remote_calls'] += calls
+                for line in lines:
+                    if not line or line.isspace():
+                        raise Exception("Translation resulted in empty text")
+                    sentence_key = miss_keys[position]
+                    position += 1
+                    translated[sentence_key] = line
+                    new_entries[sentence_key] = line
+                    cache.put((sentence_key, source, target), line)
+        if memory is not None:
+            try:
+                memory.put_many(new_entries, source, target)
+            except Exception as e:
+                print(f"Translation memory write error: {e}")
+
+    _record(counts)
+    if stats is not None:
+        stats.update(counts)
+        stats['hit_rate'] = (counts['cache_hits'] + counts['memory_hits']) / counts['sentences'] if counts['sentences'] else 0.0
+
+    # Put back the line breaks and spacing that separated the original sentences
+    return separators[0] + ''.join(translated[sentence_key] + separator
+                                   for sentence_key, separator in zip(hashes, separators[1:]))
@@ -0,0 +1,90 @@
+"""
+Compact token storage for the TextSummarizer application.
+Each token of a document is interned once into a per-document vocabulary, and
+sentences are stored as slices of one int32 array of token ids instead of lists
+of Python strings. Stop words and non-alphanumeric tokens are flagged once per
+vocabulary entry, so the rankers filter tokens with array masks.
+"""
+
+from array import array
+
+import numpy as np
+
+
+class InternedDocument:
+    """
+    Sentences of one document as token ids.
+
+    Attributes:
+        ids (numpy.ndarray): int32 token ids of all sentences, concatenated
+        offsets (numpy.ndarray): Sentence i is ids[offsets[i]:offsets[i + 1]]
+        terms (list): Token string of each id
+        stop (numpy.ndarray): True for ids that are stop words
+        content (numpy.ndarray): True for ids that are alphanumeric and not stop words
+    """
+
+    def __init__(self, ids, offsets, terms, stop, content):
+        self.ids = ids
+        self.offsets = offsets
+        self.terms = terms
+        self.stop = stop
+        self.content = content
+
+    @classmethod
+    def from_sentences(cls, sentences, tokenize, stop_words):
+        """
+        Tokenize and intern sentences one at a time, so the token lists of the whole
+        document never exist at once.
+
+        Args:
+            sentences (iterable): Sentence strings
+            tokenize (callable): Returns the (lowercased) tokens of one sentence
+            stop_words (set): Tokens to flag as stop words
+        """
+        return cls.from_tokens((tokenize(sentence) for sentence in sentences), stop_words)
+
+    @classmethod
+    def from_tokens(cls, sentence_tokens, stop_words):
+        index = {}
+        terms = []
+        ids = array('i')
+        offsets = array('q', [0])
+        for tokens in sentence_tokens:
+            for token in tokens:
+                token_id = index.get(token)
+                if token_id is None:
+                    token_id = index[token] = len(terms)
+                    terms.append(token)
+                ids.append(token_id)
+            offsets.append(len(ids))
+        stop = np.fromiter((term in stop_words for term in terms), dtype=bool, count=len(terms))
+        alphanumeric = np.fromiter((term.isalnum() for term in terms), dtype=bool, count=len(terms))
+        return cls(np.frombuffer(ids, dtype=np.int32), np.frombuffer(offsets, dtype=np.int64),
+                   terms, stop, alphanumeric & ~stop)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def sentence(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def rows(self):
+        """Sentence index of every entry in ids."""
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.lengths())
+
+    def select(self, indices):
+        """A document of the given sentences, sharing this document's vocabulary."""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts, lengths = self.offsets[indices], self.lengths()[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return InternedDocument(self.ids[positions], offsets, self.terms, self.stop, self.content)
+
+    def nbytes(self):
+        """Bytes used by the id arrays and flags (the vocabulary strings are counted once)."""
+        return (self.ids.nbytes + self.offsets.nbytes + self.stop.nbytes + self.content.nbytes
+                + sum(len(term) + 49 for term in self.terms))